@@ -0,0 +1,13 @@
+'''
+Benchmark the heuristics over the instances' files from the command line.
+
+Exits with status 1 if there is any regression over the baseline.
+'''
+
+import sys
+
+from benchmarker import run_benchmarks, parse_arguments
+
+args = parse_arguments()
+if not run_benchmarks(*args):
+    sys.exit(1)
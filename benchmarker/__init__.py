@@ -0,0 +1,6 @@
+'''
+Package to benchmark the heuristics and the distances matrix over the instances' files.
+'''
+
+from .run_benchmarks import run_benchmarks, compare_results
+from .cl_argsparse import parse_arguments
@@ -0,0 +1,72 @@
+'''
+Command line arguments parser.
+
+Module to parse arguments from the command line.
+
+The parsed arguments are then used in other module to run the benchmarks.
+'''
+
+import argparse
+from typing import List, Tuple
+
+from validations import is_positive_int, is_time
+from .run_benchmarks import FAMILIES
+
+def parse_arguments() -> Tuple[List[str], int, int, str, str, float]:
+    '''
+    An ArgumentParser object receives arguments from the command line
+    and returns them in a tuple of 6 elements:
+
+    (families: List[str], files: int, repeat: int, output: str, baseline: str, threshold: float)
+    '''
+    # parser's description display when --help is used
+    description = '''Times the distances matrix, GC, IF, IM and the objective function
+        over the instances' files, and compares the times with a baseline'''
+    # instantiate argument parser
+    parser = argparse.ArgumentParser(description=description)
+
+    parser.add_argument(
+        '-f', '--families',
+        nargs='+',
+        choices=FAMILIES,
+        default=list(FAMILIES),
+        help='families of instances as <n>_<p>, default to all of them'
+    )
+    parser.add_argument(
+        '-n', '--number',
+        type=is_positive_int,
+        default=3,
+        help='number of files of each family, default to 3'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=is_positive_int,
+        default=5,
+        help='repetitions of each benchmark, the best time is kept, default to 5'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        metavar='FILE',
+        help='save the results to a JSON file in the benchmarks/ subdirectory'
+    )
+    parser.add_argument(
+        '-b', '--baseline',
+        metavar='FILE',
+        help='compare the results with a JSON file of previous results in the benchmarks/ subdirectory'
+    )
+    parser.add_argument(
+        '-t', '--threshold',
+        type=is_time,
+        default=0.2,
+        help='relative slowdown over the baseline considered a regression, default to 0.2 (20%%)'
+    )
+
+    arguments = parser.parse_args()
+    return (
+        arguments.families,
+        arguments.number,
+        arguments.repeat,
+        arguments.output,
+        arguments.baseline,
+        arguments.threshold
+    )
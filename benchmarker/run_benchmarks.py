@@ -0,0 +1,152 @@
+'''
+Module to time the heuristics over the instances' files and compare the times with a baseline.
+
+The results are saved in the benchmarks/ subdirectory as a JSON file:
+
+{
+    "environment": {...},
+    "results": {"<n>_<p>": {"<benchmark>": seconds, ...}, ...}
+}
+
+where the seconds of a benchmark are the sum over the files of the family
+of the best time of the repetitions.
+'''
+
+import os
+import sys
+import json
+import timeit
+import platform
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from file_handling import read_instance
+from file_handling.path import get_filepath
+from heuristic.constructive import greedy_construction
+from heuristic.local_search import first_interchange, best_interchange
+from heuristic.functions import objective_function
+from models import PDPInstance
+
+# families of the instances' files, as <n>_<p>
+FAMILIES = ('100_10', '500_37', '1000_50')
+BENCHMARKS = ('matrix', 'GC', 'IF', 'IM', 'OF')
+
+Results = Dict[str, Dict[str, float]]
+
+def family_files(family: str, number: int) -> List[str]:
+    '''
+    Returns the names of the first number .dat files of a family, in order.
+    '''
+    prefix = family + '_'
+    files = sorted(
+        file for file in os.listdir(get_filepath(''))
+        if file.startswith(prefix) and file.endswith('.dat')
+    )
+    return files[:number]
+
+def time_function(function: Callable, repeat: int) -> float:
+    '''
+    Returns the best time in seconds of calling a function repeat times.
+    '''
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def benchmark_file(filename: str, repeat: int) -> Dict[str, float]:
+    '''
+    Times each benchmark on the instance of a file.
+    The local searches start from the solution of GC.
+    '''
+    instance = read_instance(filename, cache=False)
+    if instance is None:
+        raise ValueError(f'file {filename} could not be read')
+    solution = greedy_construction(instance)
+    benchmarks = {
+        'matrix': lambda: PDPInstance(instance.p, None, coordinates=instance.coordinates),
+        'GC': lambda: greedy_construction(instance),
+        'IF': lambda: first_interchange(instance, solution),
+        'IM': lambda: best_interchange(instance, solution),
+        'OF': lambda: objective_function(solution, instance.distances)
+    }
+    return {name: time_function(benchmarks[name], repeat) for name in BENCHMARKS}
+
+def run_benchmarks(families: List[str], files: int, repeat: int, output: str, baseline: str,
+                   threshold: float) -> bool:
+    '''
+    Runs the benchmarks over the files of the families:
+
+    files: number of files of each family.
+
+    repeat: repetitions of each benchmark, its best time is kept.
+
+    output: name of the JSON file to save the results to, if any.
+
+    baseline: name of the JSON file of previous results to compare with, if any.
+
+    threshold: relative slowdown over the baseline that is a regression, e.g. 0.2 for 20%.
+
+    Returns False if there is any regression.
+    '''
+    results = {}
+    for family in families:
+        filenames = family_files(family, files)
+        if not filenames:
+            print(f'  error: there are no instances of the family {family}')
+            continue
+        totals = dict.fromkeys(BENCHMARKS, 0.0)
+        for filename in filenames:
+            for name, seconds in benchmark_file(filename, repeat).items():
+                totals[name] += seconds
+        results[family] = totals
+        print(f'{family} ({len(filenames)} files): ' + ', '.join(
+            f'{name} = {seconds:.4g} s' for name, seconds in totals.items()
+        ))
+
+    if output:
+        folder = get_filepath('', 'benchmarks')
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(get_filepath(output, 'benchmarks'), 'w') as file:
+            json.dump({'environment': environment(repeat, files), 'results': results}, file, indent=2)
+        print(f'Benchmark results have been saved to file {output}.')
+
+    if not baseline:
+        return True
+    try:
+        with open(get_filepath(baseline, 'benchmarks'), 'r') as file:
+            previous = json.load(file)['results']
+    except (IOError, OSError, ValueError, KeyError) as error:
+        print('The baseline could not be read:\n', error)
+        return False
+
+    regressions = compare_results(previous, results, threshold)
+    for family, name, old, new in regressions:
+        print(f'  regression: {family} {name} {old:.4g} s -> {new:.4g} s (x{new / old:.3g})')
+    print(f'Regressions over {threshold:.0%}: {len(regressions)}')
+    return not regressions
+
+def compare_results(baseline: Results, results: Results,
+                    threshold: float) -> List[Tuple[str, str, float, float]]:
+    '''
+    Returns the (family, benchmark, baseline seconds, seconds) of the benchmarks
+    in both results that are slower than the baseline by more than the threshold.
+    '''
+    regressions = []
+    for family, benchmarks in results.items():
+        for name, seconds in benchmarks.items():
+            old = baseline.get(family, {}).get(name)
+            if old is not None and seconds > old * (1 + threshold):
+                regressions.append((family, name, old, seconds))
+    return regressions
+
+def environment(repeat: int, files: int) -> dict:
+    '''
+    Returns the description of where and how the benchmarks ran.
+    '''
+    return {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'repeat': repeat,
+        'files': files
+    }
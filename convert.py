@@ -0,0 +1,8 @@
+'''
+Convert instances' files between the .dat and the binary format from the command line.
+'''
+
+from converter import convert_instances, parse_arguments
+
+args = parse_arguments()
+convert_instances(*args)
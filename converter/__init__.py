@@ -0,0 +1,6 @@
+'''
+Package to convert the files of instances between the .dat and the binary format.
+'''
+
+from .convert_instances import convert_instances
+from .cl_argsparse import parse_arguments
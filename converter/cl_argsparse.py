@@ -0,0 +1,59 @@
+'''
+Command line arguments parser.
+
+Module to parse arguments from the command line.
+
+The parsed arguments are then used in other module to convert the files of instances.
+'''
+
+import sys
+import argparse
+from typing import List, Tuple
+
+def parse_arguments() -> Tuple[List[str], bool, bool]:
+    '''
+    An ArgumentParser object receives arguments from the command line
+    and returns them in a tuple of 3 elements:
+
+    (files: List[str], to_text: bool, verbose: bool)
+
+    If no arguments are given the program will end.
+    '''
+    # parser's description display when --help is used
+    description = '''Converts files of instances in the instances/ subdirectory
+        from .dat to the binary format (.pdp), which is read faster, or the other way'''
+    # instantiate argument parser
+    parser = argparse.ArgumentParser(description=description)
+
+    parser.add_argument(
+        'files',
+        nargs='*',
+        help='names of the files to convert'
+    )
+    parser.add_argument(
+        '-a', '--all',
+        action='store_true',
+        help='convert every file of the instances/ subdirectory'
+    )
+    parser.add_argument(
+        '-d', '--to-dat',
+        action='store_true',
+        help='convert binary files to .dat, default to False'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='output each converted file'
+    )
+
+    # if no arguments are given, display help as if -h was used
+    if len(sys.argv) == 1:
+        parser.print_help()
+        sys.exit(1)
+
+    # parse arguments from command line
+    arguments = parser.parse_args()
+    if arguments.all == bool(arguments.files):
+        parser.error('either files or argument -a/--all must be given')
+
+    return (None if arguments.all else arguments.files, arguments.to_dat, arguments.verbose)
@@ -0,0 +1,38 @@
+'''
+Module to convert the files of instances.
+'''
+
+import os
+from typing import List
+
+from file_handling import convert_instance
+from file_handling.path import get_filepath
+from file_handling.binary import BINARY_SUFFIX, TEXT_SUFFIX
+
+def convert_instances(files: List[str], to_text: bool, verbose: bool):
+    '''
+    Converts files of instances in the instances/ subdirectory:
+
+    files: names of the files, or None to convert all of them.
+
+    to_text: whether to convert binary files to .dat, otherwise .dat files are converted to binary.
+
+    verbose: output verbosity.
+    '''
+    suffix = BINARY_SUFFIX if to_text else TEXT_SUFFIX
+    if files is None:
+        files = sorted(file for file in os.listdir(get_filepath('')) if file.endswith(suffix))
+
+    for filename in files:
+        if not filename.endswith(suffix):
+            print(f'  {filename} is not a {suffix} file.')
+            continue
+        try:
+            converted = convert_instance(filename)
+        except (IOError, OSError) as error:
+            print(f'  {filename} could not be converted:\n', error)
+        except ValueError as error:
+            print(f'  File {filename} has invalid format: {error}.')
+        else:
+            if verbose:
+                print(f'  {filename} -> {converted}')
@@ -0,0 +1,6 @@
+'''
+Package of the exact algorithms for the PDP and the bounds of its optimal objective function value.
+'''
+
+from .bounds import degree_bound, packing_bound, upper_bound
+from .threshold import ExactResult, solve_exact
@@ -0,0 +1,81 @@
+'''
+Upper bounds of the optimal objective function value of the PDP.
+
+Degree bound: if the optimal value is d, each of the p points of an optimal solution has at least p - 1 others
+at distance d or more, i.e. its (p - 1)-th farthest neighbor is at distance d or more.
+So at least p points have their (p - 1)-th farthest neighbor at distance d or more,
+and d is at most the p-th largest of those distances.
+
+Packing bound: by Oler's inequality, at most 2A / (sqrt(3) d^2) + P / (2d) + 1 points
+at distance d or more from each other fit in a convex region of area A and perimeter P,
+as the convex hull of the points, so d is at most the one where that is p.
+'''
+
+from math import floor, sqrt
+
+import numpy as np
+
+from models import PDPInstance
+from models.geometry import convex_hull
+
+# rows of distances computed at once
+BLOCK_SIZE = 256
+
+def farthest_neighbors(instance: PDPInstance, k: int) -> np.ndarray:
+    '''
+    Returns the distance from each point to its k-th farthest neighbor,
+    in one pass over the rows of the distances in blocks, whatever their storage.
+    '''
+    n = instance.n
+    columns = np.arange(n)
+    farthest = np.empty(n, dtype=np.int64)
+    for start in range(0, n, BLOCK_SIZE):
+        rows = columns[start:start + BLOCK_SIZE]
+        block = instance.distances[rows[:, np.newaxis], columns]
+        # the distance to the point itself is 0, the smallest one,
+        # so the k-th largest of the row is the one of the other points
+        farthest[rows] = np.partition(block, n - k, axis=1)[:, n - k]
+    return farthest
+
+def degree_bound(instance: PDPInstance) -> int:
+    '''
+    Returns an upper bound of the optimal objective function value of an instance:
+    the p-th largest distance from a point to its (p - 1)-th farthest neighbor.
+    '''
+    n, p = instance.n, instance.p
+    farthest = farthest_neighbors(instance, p - 1)
+    return int(np.partition(farthest, n - p)[n - p])
+
+def packing_bound(instance: PDPInstance) -> int:
+    '''
+    Returns an upper bound of the optimal objective function value of an instance
+    by the packing of p points in the convex hull of its points.
+    '''
+    coordinates = instance.coordinates
+    hull = coordinates[convex_hull(coordinates)].astype(np.float64)
+    following = np.roll(hull, -1, axis=0)
+    # shoelace formula, the hull is in counterclockwise order
+    area = (hull[:, 0] @ following[:, 1] - hull[:, 1] @ following[:, 0]) / 2
+    perimeter = np.hypot(*(following - hull).T).sum()
+    # the positive root of 2A / sqrt(3) u^2 + P / 2 u + 1 - p = 0, where u = 1 / d
+    a, b, c = 2 * area / sqrt(3), perimeter / 2, 1 - instance.p
+    if a > 0:
+        u = (-b + sqrt(b * b - 4 * a * c)) / (2 * a)
+    elif b > 0:
+        u = -c / b
+    # all the points are the same
+    else:
+        return 0
+    # the distances are truncated, and the slack absorbs the rounding errors
+    return floor(1 / u + 1e-6)
+
+def upper_bound(instance: PDPInstance) -> int:
+    '''
+    Returns the least of the upper bounds of the optimal objective function value of an instance.
+
+    The degree bound is skipped with the 'lazy' storage, as it computes every distance
+    and is seldom the least one.
+    '''
+    if instance.storage == 'lazy':
+        return packing_bound(instance)
+    return min(degree_bound(instance), packing_bound(instance))
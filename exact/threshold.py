@@ -0,0 +1,202 @@
+'''
+Exact algorithm for the PDP by binary search over the distances.
+
+The optimal objective function value is one of the distances between the points,
+and a threshold d is feasible if there are p points that are pairwise at distance d or more,
+i.e. a clique of size p in the graph of the pairs of points at distance d or more.
+As feasibility is monotone in d, the greatest feasible distance is found by binary search,
+checking each threshold by a branch and bound search of a clique of size p
+over bitsets of the graph kept in Python integers.
+'''
+
+import timeit
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from models import PDPInstance, Solution
+from heuristic.functions import objective_function
+from heuristic.budget import Budget
+from .bounds import upper_bound
+
+class ExactResult(NamedTuple):
+    '''
+    Result of the exact algorithm: the best solution found, its objective function value
+    as lower bound, the upper bound of the optimal value, whether the lower bound is proven
+    optimal (both bounds are equal), and the seconds it took.
+    '''
+    solution: Solution
+    lower_bound: int
+    upper_bound: int
+    optimal: bool
+    time: float
+
+class _Timeout(Exception):
+    '''
+    The time limit ran out during the search of a clique.
+    '''
+
+def popcount(bitset: int) -> int:
+    '''
+    Returns the number of bits set in a bitset.
+    '''
+    return bin(bitset).count('1')
+
+def full_matrix(instance: PDPInstance) -> np.ndarray:
+    '''
+    Returns the n * n distances matrix of an instance, whatever its storage.
+    '''
+    if instance.storage == 'full':
+        return np.asarray(instance.distances)
+    return np.array([instance.distances[i] for i in range(instance.n)])
+
+def threshold_graph(matrix: np.ndarray, threshold: int) -> List[int]:
+    '''
+    Returns the bitsets of the neighbors of each point in the graph
+    of the pairs of points at the threshold distance or more.
+    '''
+    adjacent = matrix >= threshold
+    np.fill_diagonal(adjacent, False)
+    packed = np.packbits(adjacent, axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+def find_clique(neighbors: List[int], size: int, budget: Budget) -> Optional[List[int]]:
+    '''
+    Returns the indexes of a clique of the given size, or None if there is none,
+    raising _Timeout if the budget runs out.
+    '''
+    n = len(neighbors)
+    # the points with less than size - 1 neighbors can't be in the clique, and
+    # without them others could have less, so they are removed until none is left (k-core)
+    candidates = (1 << n) - 1
+    removed = True
+    while removed:
+        removed = False
+        bitset = candidates
+        while bitset:
+            lowest = bitset & -bitset
+            v = lowest.bit_length() - 1
+            bitset ^= lowest
+            if popcount(neighbors[v] & candidates) < size - 1:
+                candidates ^= lowest
+                removed = True
+
+    clique = []
+    nodes = [0]
+
+    def expand(candidates: int, missing: int) -> bool:
+        nodes[0] += 1
+        if budget.exhausted(0):
+            raise _Timeout
+        # color the candidates greedily, the points of a color are not adjacent,
+        # so a clique has at most one point of each color
+        order = []
+        uncolored = candidates
+        color = 0
+        while uncolored:
+            color += 1
+            available = uncolored
+            while available:
+                lowest = available & -available
+                v = lowest.bit_length() - 1
+                available &= ~neighbors[v] & ~lowest
+                uncolored ^= lowest
+                order.append((v, color))
+
+        # the points of the greatest colors first
+        for v, color in reversed(order):
+            # the clique can't get the missing points with fewer colors
+            if color < missing:
+                return False
+            clique.append(v)
+            if missing == 1 or expand(candidates & neighbors[v], missing - 1):
+                return True
+            clique.pop()
+            candidates &= ~(1 << v)
+        return False
+
+    if popcount(candidates) >= size and expand(candidates, size):
+        return clique
+    return None
+
+def clique_objective(clique: List[int], matrix: np.ndarray) -> int:
+    '''
+    Returns the objective function value of the points of a clique, by their indexes.
+    '''
+    rows, columns = np.triu_indices(len(clique), 1)
+    indexes = np.array(clique)
+    return int(matrix[indexes[rows], indexes[columns]].min())
+
+def solve_exact(instance: PDPInstance, solution: Solution = None, time_limit: float = None,
+                verbose: bool = False, bound: int = None) -> ExactResult:
+    '''
+    Solves a PDP instance to optimality by binary search over its distinct distances,
+    checking if each threshold is feasible by searching a clique of size p.
+
+    solution: a solution found by a heuristic, its objective function value is a lower bound
+    so only the greater distances are searched. If it's not given, the first p points are.
+
+    time_limit: seconds to search, if they run out the result has the bounds proven so far.
+    Each threshold is checked for at most half of the time left, and if it runs out,
+    lower thresholds are checked to improve the lower bound meanwhile.
+
+    verbose: whether to output each threshold checked.
+
+    bound: an upper bound of the optimal objective function value, if it's already known.
+    '''
+    start = timeit.default_timer()
+    budget = Budget(time_limit)
+    matrix = full_matrix(instance)
+    p = instance.p
+    # distinct distances between different points, in increasing order
+    distances = np.unique(matrix[np.triu_indices(instance.n, 1)])
+
+    if solution is None:
+        # any p points are a solution
+        solution = instance.points[:p]
+    best = [point.index for point in solution]
+    lower_bound = objective_function(solution, matrix)
+    # positions of the greatest distance known to be feasible and of the greatest one that may be,
+    # not greater than the upper bound
+    low = int(np.searchsorted(distances, lower_bound))
+    if bound is None:
+        bound = upper_bound(instance)
+    high = int(np.searchsorted(distances, bound, 'right')) - 1
+
+    # the greatest position to check next, the thresholds above it up to high
+    # ran out of their time and are left unknown
+    probe = high
+    while low < high and not budget.exhausted(0):
+        middle = (low + probe + 1) // 2
+        threshold = int(distances[middle])
+        # each check gets half of the time left, so a hard threshold doesn't take all of it
+        remaining = None if time_limit is None else time_limit - (timeit.default_timer() - start)
+        try:
+            clique = find_clique(
+                threshold_graph(matrix, threshold), p, Budget(None if remaining is None else remaining / 2)
+            )
+        except _Timeout:
+            if verbose:
+                print(f'  d = {threshold}: unknown, out of its time')
+            # the lower thresholds are easier to prove feasible
+            probe = middle - 1
+        else:
+            if clique is None:
+                high = middle - 1
+                probe = min(probe, high)
+            else:
+                # the clique may be farther apart than the threshold
+                low = int(np.searchsorted(distances, clique_objective(clique, matrix)))
+                best = clique
+            if verbose:
+                state = 'infeasible' if clique is None else 'feasible'
+                print(f'  d = {threshold}: {state}, bounds [{distances[low]}, {distances[high]}], '
+                      f'{timeit.default_timer() - start:.3g} s')
+        # once there are no thresholds left below the unknown ones, they are checked again
+        if probe <= low:
+            probe = high
+
+    solution = [instance.points[i] for i in sorted(best)]
+    return ExactResult(
+        solution, int(distances[low]), int(distances[high]), low == high, timeit.default_timer() - start
+    )
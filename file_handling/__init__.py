@@ -2,5 +2,5 @@
 Package for handling files and directories (folders).
 '''
 
-from .file_io import write_instance, read_instance, write_results
-from .path import list_files
+from .file_io import write_instance, read_instance, set_file_distances, write_results, convert_instance
+from .path import list_files, free_indexes
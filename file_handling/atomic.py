@@ -0,0 +1,25 @@
+'''
+Module for writing files atomically.
+'''
+
+import os
+from typing import BinaryIO, Callable
+
+def write_atomically(filepath: str, write: Callable[[BinaryIO], None], ignore_errors: bool = False):
+    '''
+    Writes a binary file with the function write, to a temporary file that is then renamed,
+    so no other process could read an incomplete file.
+
+    ignore_errors: whether to not raise an OSError if the file can't be written.
+    '''
+    temporary_path = f'{filepath}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_path, 'wb') as file:
+            write(file)
+        os.replace(temporary_path, filepath)
+    except OSError:
+        if not ignore_errors:
+            raise
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
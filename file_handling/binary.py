@@ -0,0 +1,92 @@
+'''
+Module for the binary format of the instances' files, which is read in one bulk read.
+
+A binary file is named as the .dat file of the instance but with the suffix .pdp,
+and it contains a fixed header followed by the coordinates of the n points:
+
+magic (4 bytes), n (uint64), p (uint64), dtype of the coordinates (8 bytes)
+x0 y0 x1 y1 ... (n * 2 packed values of dtype)
+
+The index of each point is its position, as in the .dat files.
+'''
+
+import os
+import struct
+from typing import BinaryIO, Tuple
+
+import numpy as np
+
+from .atomic import write_atomically
+
+BINARY_SUFFIX = '.pdp'
+TEXT_SUFFIX = '.dat'
+MAGIC = b'PDPB'
+# little-endian without padding
+HEADER = struct.Struct('<4sQQ8s')
+# types for the coordinates, the smallest one where they fit is used
+COORDINATE_DTYPES = ('<i2', '<i4', '<i8')
+
+def binary_name(filename: str) -> str:
+    '''
+    Returns the name of the binary file of a .dat file.
+    '''
+    return filename[:-len(TEXT_SUFFIX)] + BINARY_SUFFIX
+
+def text_name(filename: str) -> str:
+    '''
+    Returns the name of the .dat file of a binary file.
+    '''
+    return filename[:-len(BINARY_SUFFIX)] + TEXT_SUFFIX
+
+def is_binary_fresh(text_path: str, binary_path: str) -> bool:
+    '''
+    Returns True if the binary file exists and was not written before the last change of the .dat file,
+    so it has the same instance.
+    '''
+    try:
+        binary_time = os.stat(binary_path).st_mtime_ns
+    except OSError:
+        return False
+    try:
+        return binary_time >= os.stat(text_path).st_mtime_ns
+    except OSError:
+        # there is only the binary file
+        return True
+
+def write_binary(filepath: str, p: int, coordinates: np.ndarray):
+    '''
+    Writes the coordinates (n, 2) and p of an instance to a binary file,
+    with the smallest type where the coordinates fit.
+    '''
+    for dtype in COORDINATE_DTYPES:
+        limits = np.iinfo(np.dtype(dtype))
+        if not len(coordinates) or (coordinates.min() >= limits.min and coordinates.max() <= limits.max):
+            break
+    header = HEADER.pack(MAGIC, len(coordinates), p, dtype.encode())
+
+    def write(file: BinaryIO):
+        file.write(header)
+        file.write(np.ascontiguousarray(coordinates, dtype=dtype).tobytes())
+
+    write_atomically(filepath, write)
+
+def read_binary(filepath: str) -> Tuple[int, np.ndarray]:
+    '''
+    Reads a binary file and returns p and the coordinates (n, 2) of its instance.
+
+    Raises ValueError if the file has an invalid format.
+    '''
+    with open(filepath, 'rb') as file:
+        content = file.read()
+    if len(content) < HEADER.size:
+        raise ValueError('incomplete header')
+    magic, n, p, dtype = HEADER.unpack_from(content)
+    dtype = dtype.rstrip(b'\0').decode('ascii', 'replace')
+    if magic != MAGIC or dtype not in COORDINATE_DTYPES:
+        raise ValueError('invalid header')
+    dtype = np.dtype(dtype)
+    if len(content) != HEADER.size + n * 2 * dtype.itemsize:
+        raise ValueError('invalid size')
+
+    coordinates = np.frombuffer(content, dtype=dtype, offset=HEADER.size).reshape(n, 2)
+    return (p, coordinates.astype(np.int64))
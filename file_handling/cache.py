@@ -0,0 +1,87 @@
+'''
+Module for caching the distances matrices of the instances' files.
+
+The matrix of an instance is saved next to its file as a .npy file named
+
+<file>.<storage>.<digest>.npy
+
+where digest is a hash of the content of the file, so the cache of a modified file
+is detected as stale and rebuilt. The cached matrix is memory-mapped when loaded.
+'''
+
+import os
+import glob
+import hashlib
+
+import numpy as np
+
+from models import PDPInstance, CondensedMatrix
+from .atomic import write_atomically
+
+# change it whenever the way distances are computed or stored changes,
+# to invalidate every existing cache
+CACHE_VERSION = b'1'
+# storages that can be cached
+CACHED_STORAGES = ('full', 'condensed')
+
+def file_digest(filepath: str) -> str:
+    '''
+    Returns a hash of the content of a file.
+    '''
+    digest = hashlib.sha256(CACHE_VERSION)
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def get_cache_path(filepath: str, storage: str, digest: str) -> str:
+    '''
+    Returns the path of the cache of an instance's file.
+    '''
+    return f'{filepath}.{storage}.{digest}.npy'
+
+def load_distances(instance: PDPInstance, filepath: str):
+    '''
+    Sets the distances of an instance read from a file,
+    loading them from its cache or computing and caching them.
+    '''
+    if instance.storage not in CACHED_STORAGES:
+        instance.set_distances()
+        return
+
+    cache_path = get_cache_path(filepath, instance.storage, file_digest(filepath))
+    if instance.storage == 'full':
+        shape = (instance.n, instance.n)
+    else:
+        shape = (instance.n * (instance.n - 1) // 2,)
+
+    try:
+        data = np.load(cache_path, mmap_mode='r')
+    except (IOError, OSError, ValueError):
+        data = None
+    # if the cache doesn't exist or is corrupted
+    if data is None or data.shape != shape or data.dtype != np.int32:
+        instance.set_distances()
+        data = instance.distances if instance.storage == 'full' else instance.distances.data
+        remove_stale_caches(filepath, instance.storage)
+        save_cache(cache_path, data)
+    elif instance.storage == 'full':
+        instance.set_distances(data)
+    else:
+        instance.set_distances(CondensedMatrix(instance.n, data))
+
+def save_cache(cache_path: str, data: np.ndarray):
+    '''
+    Writes the distances to the cache, without failing if it's not possible.
+    '''
+    write_atomically(cache_path, lambda file: np.save(file, data), ignore_errors=True)
+
+def remove_stale_caches(filepath: str, storage: str):
+    '''
+    Removes the caches of a file made from a previous content of it.
+    '''
+    for cache_path in glob.glob(glob.escape(filepath) + f'.{storage}.*.npy'):
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
@@ -4,38 +4,73 @@ Module for writing and reading instances to and from files.
 
 import os
 import csv
-from typing import List
+import warnings
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from models import PDPInstance, Point
 from .path import generate_filename, get_filepath
+from .cache import load_distances
+from .binary import (BINARY_SUFFIX, TEXT_SUFFIX, binary_name, text_name, is_binary_fresh,
+                     read_binary, write_binary)
 
-def write_instance(instance: PDPInstance):
+def write_instance(instance: PDPInstance, index: int = 0) -> Optional[str]:
     '''
-    Receives a PDP Instance and writes it to a file.
+    Receives a PDP Instance and writes it to a file,
+    with the first index from the given one whose file doesn't exist yet.
+
+    Returns the name of the file, or None if it could not be written.
     '''
-    index = 0
+    folder = get_filepath('')
+    if not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+
+    content = dat_header(instance.n, instance.p) + str(instance)
     while True:
         filename = generate_filename(instance.n, instance.p, index)
-        filepath = get_filepath(filename)
-        if os.path.exists(filepath):
+        try:
+            if os.path.exists(get_filepath(binary_name(filename))):
+                raise FileExistsError
+            # the file is created only if it doesn't exist,
+            # so concurrent writers never take the same index
+            with open(get_filepath(filename), 'x') as file:
+                file.write(content)
+            return filename
+        except FileExistsError:
             index += 1
-        else:
-            break
-
-    folder = get_filepath('')
-    if not os.path.exists(folder):
-        os.makedirs(folder)
+        except (IOError, OSError) as error:
+            print('The instance could not be written:\n', error)
+            return None
 
-    try:
-        with open(filepath, 'w') as file:
-            file.write(str(instance))
-    except (IOError, OSError) as error:
-        print('The instance could not be written:\n', error)
+def resolve_filename(filename: str) -> str:
+    '''
+    Returns the name of the file to read an instance from:
+    the binary file of a .dat file if it's up to date, or else the file itself.
+    '''
+    if filename.endswith(TEXT_SUFFIX) and is_binary_fresh(
+            get_filepath(filename), get_filepath(binary_name(filename))):
+        return binary_name(filename)
+    return filename
 
-def read_instance(filename: str) -> PDPInstance:
+def read_instance(filename: str, storage: str = 'full', cache: bool = True,
+                  distances: bool = True, cache_size: int = 256) -> PDPInstance:
     '''
-    Reads a file that contains a PDP instance and returns its object.
+    Reads a file that contains a PDP instance and returns its object,
+    with its distances kept in the specified storage.
+
+    cache: whether or not to load the distances from a cache next to the file,
+    writing it if it doesn't exist yet.
+
+    distances: whether or not to set the distances,
+    otherwise set_file_distances must be called before solving the instance.
+
+    cache_size: rows of distances cached by the 'lazy' storage.
+
+    A .dat file is read from its binary file instead if it's up to date.
+    Its p is read from its header if it has one, or else from its name.
     '''
+    filename = resolve_filename(filename)
     filepath = get_filepath(filename)
     try:
         # if file is empty
@@ -43,14 +78,19 @@ def read_instance(filename: str) -> PDPInstance:
             print('   File %s is empty.' % filename)
             return None
 
-        with open(filepath, 'r') as file:
-            # read every line of the file and parse it to constructor's arguments of Point class
-            points = [Point(*map(int, line.split())) for line in file]
-
-        # get p from filename
-        p = int(filename.split('_')[1])
+        points = None
+        if filename.endswith(BINARY_SUFFIX):
+            p, coordinates = read_binary(filepath)
+        else:
+            p, indexes, coordinates = read_dat(filepath, filename)
+            # the points are made when needed, unless their indexes are not their positions
+            if not np.array_equal(indexes, np.arange(len(indexes))):
+                points = [Point(i, x, y) for i, (x, y) in zip(indexes.tolist(), coordinates.tolist())]
+        instance = PDPInstance(p, points, False, storage, cache_size, coordinates)
+        if distances:
+            set_file_distances(instance, filename, cache)
         # return an object of PDPInstance
-        return PDPInstance(p, points)
+        return instance
     except FileNotFoundError as error:
         print('  ', error)
         return None
@@ -58,6 +98,99 @@ def read_instance(filename: str) -> PDPInstance:
         print('   File %s has invalid format.' % filename)
         return None
 
+def set_file_distances(instance: PDPInstance, filename: str, cache: bool = True):
+    '''
+    Sets the distances of an instance read from a file,
+    loading them from the cache next to the file if cache is True.
+    '''
+    if cache:
+        load_distances(instance, get_filepath(resolve_filename(filename)))
+    else:
+        instance.set_distances()
+
+def dat_header(n: int, p: int) -> str:
+    '''
+    Returns the optional first line of a .dat file, with n and p:
+
+    <n> <p>
+    '''
+    return f'{n} {p}\n'
+
+def p_from_filename(filename: str) -> Optional[int]:
+    '''
+    Returns the p of a file named as <n>_<p>_<index>.dat, or None if it's named otherwise.
+    '''
+    try:
+        return int(os.path.basename(filename).split('_')[1])
+    except (IndexError, ValueError):
+        return None
+
+def parse_dat(text: str, p: int = None) -> Tuple[int, np.ndarray, np.ndarray]:
+    '''
+    Parses the content of a .dat file in one pass,
+    with p given in case it has no header.
+
+    Returns p and the arrays of the indexes and the coordinates (n, 2) of the points.
+
+    Raises ValueError if it has an invalid format.
+    '''
+    first_line, _, body = text.partition('\n')
+    header = first_line.split()
+    if len(header) == 2:
+        n, p = map(int, header)
+    else:
+        n = None
+        body = text
+    if p is None:
+        raise ValueError('p is unknown')
+
+    with warnings.catch_warnings():
+        # older versions of NumPy only warn if there is something that is not an integer
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(body, dtype=np.int64, sep=' ')
+        except DeprecationWarning as warning:
+            raise ValueError(str(warning))
+    # each row is: index x y
+    rows = values.reshape(-1, 3)
+    if n is not None and n != len(rows):
+        raise ValueError(f'the header has n = {n} but there are {len(rows)} points')
+
+    return (p, rows[:, 0], rows[:, 1:])
+
+def read_dat(filepath: str, filename: str) -> Tuple[int, np.ndarray, np.ndarray]:
+    '''
+    Reads a .dat file in one pass, see parse_dat,
+    with p from its name in case it has no header.
+    '''
+    with open(filepath, 'r') as file:
+        return parse_dat(file.read(), p_from_filename(filename))
+
+def convert_instance(filename: str) -> str:
+    '''
+    Converts the file of an instance in the instances/ subdirectory from .dat to binary,
+    or from binary to .dat, and returns the name of the written file.
+
+    Raises ValueError if the file has an invalid format, or OSError if it can't be read or written.
+    '''
+    filepath = get_filepath(filename)
+    if filename.endswith(BINARY_SUFFIX):
+        p, coordinates = read_binary(filepath)
+        converted = text_name(filename)
+        with open(get_filepath(converted), 'w') as file:
+            file.write(dat_header(len(coordinates), p))
+            file.write('\n'.join(f'{i} {x} {y}' for i, (x, y) in enumerate(coordinates.tolist())))
+    elif filename.endswith(TEXT_SUFFIX):
+        p, indexes, coordinates = read_dat(filepath, filename)
+        # the binary format doesn't keep the indexes, they must be the positions
+        if not np.array_equal(indexes, np.arange(len(indexes))):
+            raise ValueError('the indexes of the points are not their positions')
+        converted = binary_name(filename)
+        write_binary(get_filepath(converted), p, coordinates)
+    else:
+        raise ValueError(f'unknown format of {filename}')
+    return converted
+
 def write_results(filename: str, data: List[List[str]]):
     '''
     Writes a CSV file containing the results of an experiment.
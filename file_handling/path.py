@@ -6,6 +6,8 @@ import os
 import random
 from typing import List
 
+from .binary import BINARY_SUFFIX, binary_name, text_name, is_binary_fresh
+
 def generate_filename(n: int, p: int, index: int = 0) -> str:
     '''
     Generates a name for an instance's file:
@@ -22,10 +24,39 @@ def get_filepath(filename: str, folder: str = 'instances') -> str:
     filepath = os.path.join(current_dir, '..', folder, filename)
     return os.path.abspath(filepath)
 
+def free_indexes(n: int, p: int, number: int) -> List[int]:
+    '''
+    Returns the number smallest indexes that no file of an instance of size n and p has
+    in the instances/ subdirectory, scanning it once.
+    '''
+    prefix = f'{n}_{p}_'
+    try:
+        files = os.listdir(get_filepath(''))
+    except FileNotFoundError:
+        files = []
+
+    used = set()
+    for file in files:
+        if file.startswith(prefix) and file.endswith(('.dat', BINARY_SUFFIX)):
+            index = file[len(prefix):-4]
+            if index.isdigit():
+                used.add(int(index))
+
+    indexes = []
+    index = 0
+    while len(indexes) < number:
+        if index not in used:
+            indexes.append(index)
+        index += 1
+    return indexes
+
 def list_files(size: int, number: int) -> List[str]:
     '''
     Returns a list of number .dat files in the instances/ subdirectory
     according to the specified size.
+
+    The binary file of an instance (.pdp) is listed instead of its .dat file
+    if it's up to date, as it's faster to read.
     '''
     current_dir = os.path.dirname(__file__)
     subdirectory = os.path.abspath(os.path.join(current_dir, '..', 'instances'))
@@ -42,6 +73,20 @@ def list_files(size: int, number: int) -> List[str]:
             file for file in files
             if file.startswith(prefix) and file.endswith(suffix)
         ]
+        names = set(files)
+        # the instances that only have a binary file
+        filtered_files += [
+            text_name(file) for file in files
+            if file.startswith(prefix) and file.endswith(BINARY_SUFFIX) and text_name(file) not in names
+        ]
+        filtered_files = [
+            binary_name(file)
+            if binary_name(file) in names and is_binary_fresh(
+                os.path.join(subdirectory, file), os.path.join(subdirectory, binary_name(file))
+            )
+            else file
+            for file in filtered_files
+        ]
 
         if not filtered_files:
             print(f' error: there are no instances of size {size}')
@@ -8,16 +8,16 @@ The parsed arguments are then used in other module to generate an instance.
 
 import sys
 import argparse
-from typing import Tuple
+from typing import Optional, Tuple
 
 from validations import is_valid_n, is_percentage, is_positive_int, are_valid_dimensions, is_valid_p
 
-def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int]:
+def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int, Optional[int], int]:
     '''
     An ArgumentParser object receives arguments from the command line
-    and returns them in a tuple of 4 elements.
+    and returns them in a tuple of 7 elements.
 
-    (n: int, p: int, dimensions: Tuple[int, int], instances: int)
+    (n: int, p: int, dimensions: Tuple[int, int], instances: int, verbose: int, seed: int, jobs: int)
 
     If no arguments are given the program will end.
     '''
@@ -69,6 +69,19 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int]:
         default=1,
         help='number of instances to generate, default to 1'
     )
+    optional.add_argument(
+        '-S', '--seed',
+        type=int,
+        help='''seed of the random generator to make the instances reproducible,
+            the k-th instance uses seed + k'''
+    )
+    optional.add_argument(
+        '-j', '--jobs',
+        metavar='N',
+        type=is_positive_int,
+        default=1,
+        help='number of processes to generate the instances in parallel, default to 1'
+    )
     optional.add_argument(
         '-v', '--verbose',
         type=int,
@@ -90,6 +103,9 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int]:
     # parse arguments from command line
     arguments = parser.parse_args()
 
+    if arguments.jobs > 1 and arguments.verbose == 2:
+        parser.error('argument -j/--jobs: plots can only be shown with 1 job (-v 2)')
+
     # if chosen shape is squared
     if arguments.square:
         dimensions = (arguments.square, arguments.square)
@@ -110,4 +126,4 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int]:
         sys.exit(1)
     else:
         # return parsed arguments gathered in a tuple
-        return (arguments.n, p, dimensions, arguments.number, arguments.verbose)
+        return (arguments.n, p, dimensions, arguments.number, arguments.verbose, arguments.seed, arguments.jobs)
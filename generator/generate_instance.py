@@ -2,13 +2,16 @@
 Module to generate an instance for the PDP.
 '''
 
-from typing import Tuple
+from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 from models import PDPInstance
 from models.plotter import plot_instance
-from file_handling import write_instance
+from file_handling import write_instance, free_indexes
 
-def generate_instance(n: int, p: int, dimensions: Tuple[int, int], number: int, verbose: int):
+def generate_instance(n: int, p: int, dimensions: Tuple[int, int], number: int, verbose: int,
+                      seed: Optional[int] = None, jobs: int = 1):
     '''
     Generates an random instance based on the arguments parsed:
 
@@ -22,27 +25,54 @@ def generate_instance(n: int, p: int, dimensions: Tuple[int, int], number: int,
 
     verbose: output verbosity.
 
+    seed: seed of the first instance, the next ones use the following seeds.
+
+    jobs: number of processes to generate and write the instances in parallel.
+    The output keeps the order of the instances.
+
     The generated instance is saved to a .dat file.
+    The indexes of the files are reserved at once, and if another generator
+    takes one of them meanwhile, the next free index is used.
+    '''
+    # the k-th instance is written with the k-th free index and seed + k
+    tasks = [
+        (index, None if seed is None else seed + k)
+        for k, index in enumerate(free_indexes(n, p, number))
+    ]
+    generate = partial(
+        generate_file, n=n, p=p, dimensions=dimensions, verbose=verbose, buffered=jobs > 1
+    )
+    if jobs > 1:
+        with ProcessPoolExecutor(jobs) as executor:
+            # the outputs are yielded in the order of the instances
+            for output in executor.map(generate, tasks, chunksize=max(1, number // (jobs * 4))):
+                for line in output:
+                    print(line)
+    else:
+        for _ in map(generate, tasks):
+            pass
+
+def generate_file(task: Tuple[int, Optional[int]], n: int, p: int, dimensions: Tuple[int, int], verbose: int,
+                  buffered: bool) -> List[str]:
+    '''
+    Generates an instance with the seed of the task and writes it to a file from the index of the task.
+
+    Returns its output if it's buffered instead of printed, as when generating in another process.
     '''
+    output = []
+    echo = output.append if buffered else print
+    index, seed = task
     x_max, y_max = dimensions
 
-    if not verbose:
-        str_gen = ''
-        str_wr = ''
-        str_done = ''
-    else:
-        str_gen = 'Generating instance... '
-        str_wr = 'Writing instance to file... '
-        str_done = 'done.'
+    instance = PDPInstance.random(n, p, x_max, y_max, seed)
+    if verbose:
+        echo('Generating instance... done.')
 
-    for _ in range(number):
-        print(str_gen, end='', flush=True)
-        instance = PDPInstance.random(n, p, x_max, y_max)
-        print(str_done)
+    filename = write_instance(instance, index)
+    if verbose and filename:
+        echo(f'Writing instance to file {filename}... done.')
 
-        print(str_wr, end='', flush=True)
-        write_instance(instance)
-        print(str_done)
+    if verbose == 2:
+        plot_instance(instance.points)
 
-        if verbose == 2:
-            plot_instance(instance.points)
+    return output
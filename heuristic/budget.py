@@ -0,0 +1,35 @@
+'''
+Module of the budgets that bound the running time of the heuristics.
+'''
+
+import timeit
+
+class Budget:
+    '''
+    Limit of seconds, counted from the creation of the budget,
+    and/or of iterations of each heuristic that uses it.
+
+    The heuristics check it once per iteration and, when it runs out,
+    return the best solution found so far and set converged to False.
+    '''
+
+    def __init__(self, seconds: float = None, iterations: int = None):
+        self.__deadline = None if seconds is None else timeit.default_timer() + seconds
+        self.__iterations = iterations
+        self.converged = True
+
+    def start(self):
+        '''
+        Starts a heuristic, which converges unless the budget runs out.
+        '''
+        self.converged = True
+
+    def exhausted(self, iteration: int) -> bool:
+        '''
+        Returns True if the budget ran out before the given iteration, counted from 0,
+        setting converged to False.
+        '''
+        if ((self.__iterations is not None and iteration >= self.__iterations)
+                or (self.__deadline is not None and timeit.default_timer() >= self.__deadline)):
+            self.converged = False
+        return not self.converged
@@ -2,18 +2,35 @@
 Module of the implementations of constructive heuristics for the PDP.
 '''
 
+from random import Random
+
+import numpy as np
+
 from models import PDPInstance, Solution
 from models.plotter import plot_instance_solution
+from .budget import Budget
 
-def greedy_construction(instance: PDPInstance, verbose: bool = False) -> Solution:
+def greedy_construction(instance: PDPInstance, verbose: bool = False, rcl: int = 1,
+                        rng: Random = None, budget: Budget = None) -> Solution:
     '''
     Starting by choosing the 2 farthest points,
     the algorithm adds the farthest point to the current solution until p is reached.
 
+    rcl: size of the restricted candidate list. If greater than 1, the point to add
+    is chosen at random by rng among the rcl points farthest to the solution,
+    making a randomized greedy construction as the one of GRASP.
+
+    budget: limit of time or iterations, one per added point. If it runs out,
+    the solution is completed at once with the candidates farthest to it.
+
     Returns a list of the p chosen points.
     '''
-    # copy all the instance's points
-    candidates = list(instance.points)
+    if rng is None:
+        rng = Random()
+    if budget is None:
+        budget = Budget()
+    budget.start()
+    distances = instance.distances
     # initialize the solution with the 2 farthest points
     solution = list(instance.get_farthest_points())
     if verbose:
@@ -22,26 +39,41 @@ def greedy_construction(instance: PDPInstance, verbose: bool = False) -> Solutio
         print(f'  S = {solution}')
         plot_instance_solution(instance.points, solution)
 
-    # remove them from the candidates
-    candidates.remove(solution[0])
-    candidates.remove(solution[1])
+    # mask of the points in the solution, the rest are the candidates
+    in_solution = np.zeros(instance.n, dtype=bool)
+    in_solution[[point.index for point in solution]] = True
+    # the distance between a point and a set is
+    # the smallest of the distances between the point and the members of the set,
+    # it's updated only against each new point of the solution
+    to_solution = np.minimum(distances[solution[0].index], distances[solution[1].index])
 
     # until solution has p points
     while len(solution) < instance.p:
         len_solution = len(solution)
-        # add the point farthest to the current solution
-        maximum = max(
-            # the distance between a point and a set is
-            # the smallest of the distances between the point and the members of the set
-            ((cp, min(instance.distances[cp.index][sp.index] for sp in solution))
-             for cp in candidates),
-            key=lambda x: x[1]
-        )
-        chosen_point = maximum[0]
+        to_candidates = np.where(in_solution, -1, to_solution)
+        if budget.exhausted(len_solution - 2):
+            # the farthest candidates to the current solution, the first ones in case of ties
+            missing = np.argsort(-to_candidates, kind='stable')[:instance.p - len_solution]
+            solution.extend(instance.points[i] for i in missing.tolist())
+            if verbose:
+                print('    The budget ran out, add the farthest points to current solution:')
+                print(f'    S = {solution}')
+            break
+        if rcl > 1:
+            # one of the candidates farthest to the current solution
+            k = min(rcl, instance.n - len_solution)
+            farthest = np.sort(np.argpartition(to_candidates, -k)[-k:])
+            chosen = int(farthest[rng.randrange(k)])
+        else:
+            # the candidate farthest to the current solution,
+            # the first one in case of ties
+            chosen = int(np.argmax(to_candidates))
+        chosen_point = instance.points[chosen]
         # add the new point
         solution.append(chosen_point)
         # remove it from candidates
-        candidates.remove(chosen_point)
+        in_solution[chosen] = True
+        np.minimum(to_solution, distances[chosen], out=to_solution)
 
         if verbose:
             print(f'    p = {len_solution}\n')
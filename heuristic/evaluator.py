@@ -0,0 +1,196 @@
+'''
+Module of the incremental evaluation of the objective function for interchanges of points.
+'''
+
+from typing import Tuple
+
+import numpy as np
+
+from models import Matrix, Solution
+
+# distance to no point
+INFINITY = np.iinfo(np.int64).max
+
+class SwapEvaluator:
+    '''
+    Keeps, for each point s of a solution S, its nearest and second nearest points in S,
+    so the objective function of S after an interchange of a point x in S
+    with a point y outside S is evaluated in O(p) instead of O(p^2).
+
+    The points are referred to by their indexes.
+    '''
+
+    def __init__(self, solution: Solution, dist_matrix: Matrix):
+        self.__distances = dist_matrix
+        self.__indexes = np.array([point.index for point in solution])
+        # position of each point in the solution
+        self.__positions = {index: position for position, index in enumerate(self.__indexes.tolist())}
+        # distances between the points of the solution,
+        # the distance of a point to itself doesn't count
+        self.__submatrix = np.asarray(
+            dist_matrix[self.__indexes[:, np.newaxis], self.__indexes[np.newaxis, :]], dtype=np.int64
+        )
+        np.fill_diagonal(self.__submatrix, INFINITY)
+
+        p = len(self.__indexes)
+        # positions of the nearest and second nearest points of each point
+        self.__first = np.empty(p, dtype=np.int64)
+        self.__second = np.empty(p, dtype=np.int64)
+        # and their distances
+        self.__first_distance = np.empty(p, dtype=np.int64)
+        self.__second_distance = np.empty(p, dtype=np.int64)
+        self.__update_nearest(np.arange(p))
+
+    @property
+    def objective(self) -> int:
+        '''
+        Objective function value of the current solution.
+        '''
+        return int(self.__first_distance.min())
+
+    @property
+    def indexes(self) -> np.ndarray:
+        '''
+        Indexes of the points in the current solution.
+        '''
+        return self.__indexes
+
+    def removals(self) -> np.ndarray:
+        '''
+        Returns the objective function value of the solution without each of its points,
+        in O(p^2).
+        '''
+        positions = np.arange(len(self.__indexes))
+        # distance from each point (columns) to the solution without each point (rows)
+        remaining = np.where(
+            self.__first[np.newaxis, :] == positions[:, np.newaxis],
+            self.__second_distance[np.newaxis, :],
+            self.__first_distance[np.newaxis, :]
+        )
+        np.fill_diagonal(remaining, INFINITY)
+        return remaining.min(axis=1)
+
+    def critical_degrees(self) -> np.ndarray:
+        '''
+        Returns the number of critical pairs, the ones at the minimum distance,
+        that each point of the solution is part of.
+        '''
+        return (self.__submatrix == self.objective).sum(axis=1)
+
+    def closest_points(self) -> Tuple[int, int]:
+        '''
+        Returns the indexes (i, j), i < j, of the two closest points in the solution,
+        the ones with the smallest indexes in case of ties, in O(p).
+        '''
+        minimum = self.__first_distance.min()
+        # the point with the smallest index among the ones at the minimum distance
+        at_minimum = np.flatnonzero(self.__first_distance == minimum)
+        position = at_minimum[np.argmin(self.__indexes[at_minimum])]
+        # and its partner with the smallest index
+        partners = np.flatnonzero(self.__submatrix[position] == minimum)
+        i = int(self.__indexes[position])
+        j = int(self.__indexes[partners].min())
+
+        return (i, j)
+
+    def __update_nearest(self, rows: np.ndarray):
+        '''
+        Finds the nearest and second nearest points of the points in the given positions.
+        '''
+        block = self.__submatrix[rows]
+        rng = np.arange(len(rows))
+        first = np.argmin(block, axis=1)
+        self.__first[rows] = first
+        self.__first_distance[rows] = block[rng, first]
+        block[rng, first] = INFINITY
+        second = np.argmin(block, axis=1)
+        self.__second[rows] = second
+        self.__second_distance[rows] = block[rng, second]
+
+    def removal(self, x: int) -> Tuple[int, np.ndarray]:
+        '''
+        Returns the position of the point x in the solution and the distance
+        from each point of the solution to the solution without x.
+
+        It doesn't depend on the point to add, so it can be reused for every candidate.
+        '''
+        position = self.__positions[x]
+        remaining = np.where(self.__first == position, self.__second_distance, self.__first_distance)
+        return (position, remaining)
+
+    def distances_to(self, y: int) -> np.ndarray:
+        '''
+        Returns the distances from the point y to each point of the solution.
+        '''
+        return self.__distances[y, self.__indexes]
+
+    def distances_from(self, candidates: np.ndarray) -> np.ndarray:
+        '''
+        Returns the distances from each of the candidate points (rows)
+        to each point of the solution (columns).
+        '''
+        return self.__distances[candidates[:, np.newaxis], self.__indexes[np.newaxis, :]]
+
+    @staticmethod
+    def combine_many(removal: Tuple[int, np.ndarray], distances_from: np.ndarray) -> np.ndarray:
+        '''
+        Returns the objective function value of the solution after a removal
+        and adding each of the candidate points of the given distances (rows).
+        '''
+        position, remaining = removal
+        # distance from each point to the solution without x and with each candidate
+        values = np.minimum(distances_from, remaining[np.newaxis, :])
+        # x is not in the new solutions
+        values[:, position] = INFINITY
+        return values.min(axis=1)
+
+    @staticmethod
+    def combine(removal: Tuple[int, np.ndarray], distances_to: np.ndarray, out: np.ndarray = None) -> int:
+        '''
+        Returns the objective function value of the solution after a removal
+        and adding the point y of the given distances, writing into out if given.
+        '''
+        position, remaining = removal
+        # distance from each point to the solution without x and with y
+        values = np.minimum(remaining, distances_to, out=out)
+        # x is not in the new solution
+        values[position] = INFINITY
+        return int(values.min())
+
+    def evaluate(self, x: int, y: int) -> int:
+        '''
+        Returns the objective function value of the solution
+        after removing the point x and adding the point y, in O(p).
+        '''
+        return self.combine(self.removal(x), self.distances_to(y))
+
+    def swap(self, x: int, y: int):
+        '''
+        Updates the state after removing the point x from the solution and adding the point y,
+        in O(p) plus O(p) for each point whose nearest or second nearest was x.
+        '''
+        position = self.__positions.pop(x)
+        self.__positions[y] = position
+        self.__indexes[position] = y
+
+        row = np.asarray(self.__distances[y, self.__indexes], dtype=np.int64)
+        row[position] = INFINITY
+        self.__submatrix[position, :] = row
+        self.__submatrix[:, position] = row
+
+        # the points that lost their nearest or second nearest have to look again
+        lost = (self.__first == position) | (self.__second == position)
+        lost[position] = True
+        # the others only compare their neighbors with y
+        closer = ~lost & (row < self.__first_distance)
+        between = ~lost & ~closer & (row < self.__second_distance)
+
+        self.__second[closer] = self.__first[closer]
+        self.__second_distance[closer] = self.__first_distance[closer]
+        self.__first[closer] = position
+        self.__first_distance[closer] = row[closer]
+
+        self.__second[between] = position
+        self.__second_distance[between] = row[between]
+
+        self.__update_nearest(np.flatnonzero(lost))
@@ -4,6 +4,8 @@ Supplementary functions for the heuristics.
 
 from typing import Tuple
 
+import numpy as np
+
 from models import Point, Matrix, Solution
 
 def objective_function(solution: Solution, dist_matrix: Matrix) -> int:
@@ -11,32 +13,21 @@ def objective_function(solution: Solution, dist_matrix: Matrix) -> int:
     The maximin objective function of the PDP:
     to maximize the minimum distance between any two of the points in the solution.
     '''
-    return min(
-        min(
-            dist_matrix[solution[i].index][solution[j].index]
-            for j in range(i + 1, len(solution))
-        )
-        for i in range(len(solution) - 1)
-    )
+    indexes = np.array([point.index for point in solution])
+    # every pair (i, j) of positions in the solution such that i < j
+    rows, columns = np.triu_indices(len(solution), 1)
+    return int(dist_matrix[indexes[rows], indexes[columns]].min())
 
 def get_closest_points(solution: Solution, dist_matrix: Matrix) -> Tuple[Point, Point]:
     '''
     Returns the two closest points in the solution.
     '''
-    indexes = set(p.index for p in solution)
-    # get the closest points in the solutions
-    minimums = (
-        min(
-            enumerate(row), key=lambda r: r[1] if r[0] in indexes and r[1] > 0 else float('inf')
-        )
-        for row in dist_matrix
-    )
-    closest = min(
-        enumerate(minimums), key=lambda m: m[1][1] if m[0] in indexes else float('inf')
-    )
-    # points' indexes
-    i, j = closest[0], closest[1][0]
-    p1 = next(p for p in solution if p.index == i)
-    p2 = next(p for p in solution if p.index == j)
+    points = {point.index: point for point in solution}
+    indexes = np.array(sorted(points))
+    # only the upper triangle of the solution's submatrix, in row-major order
+    rows, columns = np.triu_indices(len(indexes), 1)
+    # the first minimum is the closest pair (i, j), i < j, with the smallest indexes
+    closest = int(np.argmin(dist_matrix[indexes[rows], indexes[columns]]))
+    i, j = indexes[rows[closest]], indexes[columns[closest]]
 
-    return (p1, p2)
+    return (points[i], points[j])
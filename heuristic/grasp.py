@@ -0,0 +1,83 @@
+'''
+Implementation of the multi-start GRASP metaheuristic.
+'''
+
+from typing import Callable, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+import timeit
+import time
+
+from models import PDPInstance, Solution
+from .constructive import greedy_construction
+from .functions import objective_function
+
+LocalSearch = Callable[[PDPInstance, Solution], Solution]
+
+def grasp(instance: PDPInstance, local_search: LocalSearch, rcl: int = 3, starts: int = None,
+          budget: float = None, jobs: int = 1, seed: int = None) -> Tuple[Solution, float]:
+    '''
+    Greedy Randomized Adaptive Search Procedure (GRASP).
+
+    Repeatedly builds a solution by the randomized greedy construction
+    with a restricted candidate list of size rcl, and improves it by the local search,
+    until a number of starts or a budget of seconds runs out, whatever happens first.
+
+    The starts are run by jobs processes, which attach to the distances
+    in shared memory, and each one is seeded from seed.
+    If only a budget is given, the result depends on the speed of the processes.
+
+    Returns the best solution found, the first one in case of ties,
+    and the number of starts per second.
+    '''
+    if starts is None and budget is None:
+        raise ValueError('a number of starts or a budget of seconds is needed')
+    if starts is not None and starts < 1:
+        raise ValueError(f'invalid number of starts {starts}, must be at least 1')
+    if seed is None:
+        seed = Random().randrange(1 << 32)
+    deadline = None if budget is None else time.time() + budget
+    # the starts of each process
+    if starts is None:
+        shares = [None] * jobs
+    else:
+        shares = [starts // jobs + (job < starts % jobs) for job in range(jobs)]
+        shares = [share for share in shares if share]
+
+    start = timeit.default_timer()
+    if len(shares) > 1:
+        with instance.share(), ProcessPoolExecutor(len(shares)) as executor:
+            futures = [
+                executor.submit(grasp_starts, instance, local_search, rcl, share, deadline, seed + job)
+                for job, share in enumerate(shares)
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [grasp_starts(instance, local_search, rcl, shares[0], deadline, seed)]
+    elapsed = timeit.default_timer() - start
+
+    # the best objective function value, the first process in case of ties
+    indexes, _, _ = max(results, key=lambda result: result[1])
+    done = sum(result[2] for result in results)
+    return ([instance.points[i] for i in indexes], done / elapsed)
+
+def grasp_starts(instance: PDPInstance, local_search: LocalSearch, rcl: int, starts: int,
+                 deadline: float, seed: int) -> Tuple[List[int], int, int]:
+    '''
+    Runs starts of GRASP until their number or the deadline, a time.time() value, is reached,
+    running at least one.
+
+    Returns the indexes of the points of the best solution, the first one in case of ties,
+    its objective function value, and the number of starts done.
+    '''
+    rng = Random(seed)
+    best, best_of = None, -1
+    done = 0
+    while not done or ((starts is None or done < starts) and (deadline is None or time.time() < deadline)):
+        solution = local_search(instance, greedy_construction(instance, rcl=rcl, rng=rng))
+        done += 1
+        of = objective_function(solution, instance.distances)
+        if of > best_of:
+            best, best_of = solution, of
+
+    return ([point.index for point in best], best_of, done)
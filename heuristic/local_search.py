@@ -1,13 +1,19 @@
 '''
 Implementations of local search heuristics.
 '''
-import matplotlib.pyplot as plt
+from contextlib import ExitStack
 
-from models import PDPInstance, Solution
+import numpy as np
+
+from models import PDPInstance, Point, Solution
 from models.plotter import plot_instance_solution
-from .functions import objective_function, get_closest_points
+from .evaluator import SwapEvaluator, INFINITY
+from .parallel import CandidatePool
+from .stats import SearchStats
+from .budget import Budget
 
-def first_interchange(instance: PDPInstance, solution: Solution, verbose: bool = False) -> Solution:
+def first_interchange(instance: PDPInstance, solution: Solution, verbose: bool = False,
+                      stats: SearchStats = None, budget: Budget = None) -> Solution:
     '''
     First Pairwise Interchange heuristic (IF).
 
@@ -20,6 +26,11 @@ def first_interchange(instance: PDPInstance, solution: Solution, verbose: bool =
 
     IF performs the interchange with the first point outside S
     that improves the objective function value.
+
+    stats: counters and convergence trace to update, if given.
+
+    budget: limit of time or iterations, checked before each iteration.
+    If it runs out, the current solution, the best one so far, is returned.
     '''
     if verbose:
         print('First Pairwise Interchange (IF)')
@@ -28,31 +39,44 @@ def first_interchange(instance: PDPInstance, solution: Solution, verbose: bool =
         plot_instance_solution(instance.points, solution)
         # plt.show()
 
+    if stats is None:
+        stats = SearchStats()
+    if budget is None:
+        budget = Budget()
+    budget.start()
+    first_iteration = stats.iterations
+    evaluator = SwapEvaluator(solution, instance.distances)
+    stats.start(evaluator.objective)
     change = True
-    while change:
-        x1, x2 = get_closest_points(solution, instance.distances)
+    while change and not budget.exhausted(stats.iterations - first_iteration):
+        stats.iterations += 1
+        # the two closest points, kept by the evaluator between interchanges
+        x1, x2 = (instance.points[i] for i in evaluator.closest_points())
+
+        # the solution doesn't change until the end of the iteration,
+        # neither its objective function's value nor the distances
+        # from its points to the solution without x1 or without x2
+        ff = evaluator.objective
+        removal1 = evaluator.removal(x1.index)
+        removal2 = evaluator.removal(x2.index)
+        buffer = np.empty_like(removal1[1])
 
-        solset = set(solution)
         # candidate points outside the solution
-        candidates = (p for p in instance.points if p not in solset)
+        outside = np.ones(instance.n, dtype=bool)
+        outside[evaluator.indexes] = False
         change = False
-        for cp in candidates:
+        scanned = 0
+        for scanned, k in enumerate(np.flatnonzero(outside).tolist(), 1):
+            cp = instance.points[k]
+            to_candidate = evaluator.distances_to(k)
             # solution without point x1
-            s1 = list(solution)
-            s1.remove(x1)
-            s1.append(cp)
-
+            f1 = evaluator.combine(removal1, to_candidate, buffer)
             # solution without point x2
-            s2 = list(solution)
-            s2.remove(x2)
-            s2.append(cp)
-
-            # objective function's values
-            ff = objective_function(solution, instance.distances)
-            f1 = objective_function(s1, instance.distances)
-            f2 = objective_function(s2, instance.distances)
+            f2 = evaluator.combine(removal2, to_candidate, buffer)
 
             if verbose:
+                s1 = [p for p in solution if p != x1] + [cp]
+                s2 = [p for p in solution if p != x2] + [cp]
                 print('\n  Current solution:')
                 print(f'  S = {solution}')
                 print('  The 2 closest points in S:')
@@ -71,15 +95,23 @@ def first_interchange(instance: PDPInstance, solution: Solution, verbose: bool =
 
             # compare them
             if f1 > ff and f1 >= f2:
-                solution = list(s1)
-                change = True
+                x = x1
                 str_sx = "S'"
-                break
             elif f2 > ff and f2 >= f1:
-                solution = list(s2)
-                change = True
+                x = x2
                 str_sx = "S''"
-                break
+            else:
+                continue
+            # remove x from the solution and add the candidate
+            solution = [p for p in solution if p != x] + [cp]
+            evaluator.swap(x.index, cp.index)
+            change = True
+            break
+
+        stats.candidates += scanned
+        stats.evaluations += 2 * scanned
+        if change:
+            stats.improve(evaluator.objective)
 
         if verbose:
             if change:
@@ -91,7 +123,8 @@ def first_interchange(instance: PDPInstance, solution: Solution, verbose: bool =
 
     return solution
 
-def best_interchange(instance: PDPInstance, solution: Solution, verbose: bool = False) -> Solution:
+def best_interchange(instance: PDPInstance, solution: Solution, verbose: bool = False,
+                     jobs: int = 1, stats: SearchStats = None, budget: Budget = None) -> Solution:
     '''
     Best Pairwise Interchange heuristic (IM).
 
@@ -105,6 +138,15 @@ def best_interchange(instance: PDPInstance, solution: Solution, verbose: bool =
     IM considers all possible interchanges between x1, x2 and points
     outside S, and performs the interchange that improves the objective
     the most. Thus IM can be viewed as a greedy interchange algorithm.
+
+    jobs: number of processes to evaluate chunks of the candidates in parallel,
+    attached to the distances in shared memory, unless verbose.
+    The interchanges are the same as the ones of the serial evaluation.
+
+    stats: counters and convergence trace to update, if given.
+
+    budget: limit of time or iterations, checked before each iteration.
+    If it runs out, the current solution, the best one so far, is returned.
     '''
     if verbose:
         print('Best Pairwise Interchange (IM)')
@@ -112,74 +154,216 @@ def best_interchange(instance: PDPInstance, solution: Solution, verbose: bool =
         print(f'  S = {solution}')
         plot_instance_solution(instance.points, solution)
 
+    with ExitStack() as stack:
+        pool = None
+        if jobs > 1 and not verbose:
+            stack.enter_context(instance.share())
+            pool = stack.enter_context(CandidatePool(instance, jobs))
+
+        if stats is None:
+            stats = SearchStats()
+        if budget is None:
+            budget = Budget()
+        budget.start()
+        first_iteration = stats.iterations
+        evaluator = SwapEvaluator(solution, instance.distances)
+        stats.start(evaluator.objective)
+        change = True
+        while change and not budget.exhausted(stats.iterations - first_iteration):
+            stats.iterations += 1
+            # the two closest points, kept by the evaluator between interchanges
+            x1, x2 = (instance.points[i] for i in evaluator.closest_points())
+
+            # candidate points outside the solution
+            outside = np.ones(instance.n, dtype=bool)
+            outside[evaluator.indexes] = False
+            candidates = np.flatnonzero(outside)
+
+            ff = evaluator.objective
+            stats.candidates += len(candidates)
+            stats.evaluations += 2 * len(candidates)
+            if pool is not None:
+                best, k, position = pool.best(evaluator, [x1.index, x2.index], candidates)
+                change = best > ff
+                x = (x1, x2)[position]
+            else:
+                # objective function's values of the interchanges with every candidate at once
+                distances_from = evaluator.distances_from(candidates)
+                # solutions without point x1
+                f1 = evaluator.combine_many(evaluator.removal(x1.index), distances_from)
+                # solutions without point x2
+                f2 = evaluator.combine_many(evaluator.removal(x2.index), distances_from)
+
+                if verbose:
+                    print_interchanges(instance, solution, x1, x2, candidates, ff, f1, f2)
+
+                # the best interchange, with the first candidate in case of ties
+                # and the removal of x1 if it's as good as the removal of x2
+                best = np.maximum(f1, f2)
+                change = bool(len(candidates)) and best.max() > ff
+                if change:
+                    k = int(np.argmax(best))
+                    x = x1 if f1[k] >= f2[k] else x2
+            if change:
+                cp = instance.points[candidates[k]]
+                solution = [p for p in solution if p != x] + [cp]
+                evaluator.swap(x.index, cp.index)
+                stats.improve(evaluator.objective)
+                if verbose:
+                    print('\n  SS is best neighbor of S:')
+                    print('  S = SS')
+                    plot_instance_solution(instance.points, solution)
+            else:
+                if verbose:
+                    print('\n  Solution could not improve.')
+
+    return solution
+
+def swap_interchange(instance: PDPInstance, solution: Solution, verbose: bool = False,
+                     stats: SearchStats = None, budget: Budget = None) -> Solution:
+    '''
+    Full Swap Interchange heuristic (IS).
+
+    Receives a feasible solution S of a PDP instance and attempts
+    to improve it by interchanging a point x in the solution with
+    another point y not in the solution.
+
+    Unlike IF and IM, any point x in S can be excluded, so all the
+    p * (n - p) interchanges are considered in each iteration, and the
+    best one is performed. An interchange also improves S if it keeps
+    the objective function value but reduces the number of critical pairs,
+    the pairs of points in S at the minimum distance, as they must all be
+    broken before the objective function value can improve.
+
+    stats: counters and convergence trace to update, if given.
+
+    budget: limit of time or iterations, checked before each iteration.
+    If it runs out, the current solution, the best one so far, is returned.
+    '''
+    if verbose:
+        print('Full Swap Interchange (IS)')
+        print('  Received solution:')
+        print(f'  S = {solution}')
+        plot_instance_solution(instance.points, solution)
+
+    if stats is None:
+        stats = SearchStats()
+    if budget is None:
+        budget = Budget()
+    budget.start()
+    first_iteration = stats.iterations
+    evaluator = SwapEvaluator(solution, instance.distances)
+    stats.start(evaluator.objective)
+    p = len(solution)
+    # weight of the objective function's value over the number of critical pairs
+    # when comparing interchanges, greater than any number of pairs
+    weight = p * (p - 1) // 2 + 1
     change = True
-    while change:
-        x1, x2 = get_closest_points(solution, instance.distances)
+    while change and not budget.exhausted(stats.iterations - first_iteration):
+        stats.iterations += 1
+        ff = evaluator.objective
+        degrees = evaluator.critical_degrees()
+        critical = int(degrees.sum()) // 2
+        # objective function's value of S without each point x
+        without = evaluator.removals()
 
-        solset = set(solution)
         # candidate points outside the solution
-        candidates = (p for p in instance.points if p not in solset)
-        # temporary better solution
-        ss = list(solution)
-        change = False
-        for cp in candidates:
-            # solution without point x1
-            s1 = list(solution)
-            s1.remove(x1)
-            s1.append(cp)
+        outside = np.ones(instance.n, dtype=bool)
+        outside[evaluator.indexes] = False
+        candidates = np.flatnonzero(outside)
+        if not len(candidates):
+            break
+        stats.candidates += len(candidates)
+        stats.evaluations += p * len(candidates)
+        # distance from each candidate y (rows) to each point of S (columns)
+        distances_from = np.asarray(evaluator.distances_from(candidates), dtype=np.int64)
 
-            # solution without point x2
-            s2 = list(solution)
-            s2.remove(x2)
-            s2.append(cp)
+        # the distance from y to S without x is the one to its nearest point in S,
+        # or to its second nearest one if the nearest is x
+        nearest = np.argmin(distances_from, axis=1)
+        rows = np.arange(len(candidates))
+        first = distances_from[rows, nearest]
+        distances_from[rows, nearest] = INFINITY
+        second = distances_from.min(axis=1)
+        distances_from[rows, nearest] = first
+        to_solution = np.where(
+            np.arange(p)[np.newaxis, :] == nearest[:, np.newaxis],
+            second[:, np.newaxis],
+            first[:, np.newaxis]
+        )
+        # objective function's value of every interchange of x (columns) with y (rows)
+        values = np.minimum(without[np.newaxis, :], to_solution)
 
-            # objective function's values
-            ff = objective_function(ss, instance.distances)
-            f1 = objective_function(s1, instance.distances)
-            f2 = objective_function(s2, instance.distances)
+        # critical pairs left by every interchange that keeps the objective function's value:
+        # the ones of S not including x plus the ones of y with S without x
+        at_minimum = distances_from == ff
+        pairs = critical - degrees[np.newaxis, :] + at_minimum.sum(axis=1)[:, np.newaxis] - at_minimum
+        pairs[values != ff] = 0
 
+        # the best interchange, the first one in case of ties
+        scores = values * weight - pairs
+        k, position = np.unravel_index(np.argmax(scores), scores.shape)
+        change = bool(scores[k, position] > ff * weight - critical)
+        if change:
+            x = instance.points[evaluator.indexes[position]]
+            cp = instance.points[candidates[k]]
+            solution = [p for p in solution if p != x] + [cp]
+            evaluator.swap(x.index, cp.index)
+            stats.improve(evaluator.objective)
             if verbose:
                 print('\n  Current solution:')
+                print(f'  f(S) = {ff}, with {critical} critical pairs')
+                print('  Best interchange:')
+                print(f'    x = {repr(x)}')
+                print(f'    y = {repr(cp)}')
+                print(f"    f(S') = {values[k, position]}")
                 print(f'  S = {solution}')
-                print('  The 2 closest points in S:')
-                print(f'  x1 = {repr(x1)}')
-                print(f'  x2 = {repr(x2)}')
-                print('  Temporary solution:')
-                print(f'  SS = {ss}')
-                print('    Current point outside S:')
-                print(f'    xk = {repr(cp)}')
-                print('    Remove x1 and add xk:')
-                print(f"    S' = {s1}")
-                print('    Remove x2 and add xk:')
-                print(f"    S'' = {s2}")
-                print('    Compare the objective function evaluations:')
-                print(f'    f(SS) = {ff}')
-                print(f"    f(S') = {f1}")
-                print(f"    f(S'') = {f2}")
-            str_sx = ''
-            # compare them
-            if f1 > ff and f1 >= f2:
-                ss = list(s1)
-                change = True
-                str_sx = "S'"
-            elif f2 > ff and f2 >= f1:
-                ss = list(s2)
-                change = True
-                str_sx = "S''"
-
-            if verbose and str_sx:
-                print(f'\n    {str_sx} is better than current SS:')
-                print(f'    SS = {str_sx}')
-                plot_instance_solution(instance.points, ss)
-
-        if change:
-            solution = list(ss)
-            if verbose:
-                print('\n  SS is best neighbor of S:')
-                print('  S = SS')
                 plot_instance_solution(instance.points, solution)
-        else:
-            if verbose:
-                print('\n  Solution could not improve.')
+        elif verbose:
+            print('\n  Solution could not improve.')
 
     return solution
+
+def print_interchanges(instance: PDPInstance, solution: Solution, x1: Point, x2: Point,
+                       candidates: np.ndarray, ff: int, f1: np.ndarray, f2: np.ndarray):
+    '''
+    Outputs each step of an iteration of IM from the evaluations of all the candidates,
+    keeping the temporary better solution SS as they are compared one by one.
+    '''
+    # temporary better solution
+    ss = list(solution)
+    for k, cp in enumerate(instance.points[i] for i in candidates):
+        s1 = [p for p in solution if p != x1] + [cp]
+        s2 = [p for p in solution if p != x2] + [cp]
+        print('\n  Current solution:')
+        print(f'  S = {solution}')
+        print('  The 2 closest points in S:')
+        print(f'  x1 = {repr(x1)}')
+        print(f'  x2 = {repr(x2)}')
+        print('  Temporary solution:')
+        print(f'  SS = {ss}')
+        print('    Current point outside S:')
+        print(f'    xk = {repr(cp)}')
+        print('    Remove x1 and add xk:')
+        print(f"    S' = {s1}")
+        print('    Remove x2 and add xk:')
+        print(f"    S'' = {s2}")
+        print('    Compare the objective function evaluations:')
+        print(f'    f(SS) = {ff}')
+        print(f"    f(S') = {f1[k]}")
+        print(f"    f(S'') = {f2[k]}")
+        str_sx = ''
+        # compare them
+        if f1[k] > ff and f1[k] >= f2[k]:
+            ss = s1
+            ff = f1[k]
+            str_sx = "S'"
+        elif f2[k] > ff and f2[k] >= f1[k]:
+            ss = s2
+            ff = f2[k]
+            str_sx = "S''"
+
+        if str_sx:
+            print(f'\n    {str_sx} is better than current SS:')
+            print(f'    SS = {str_sx}')
+            plot_instance_solution(instance.points, ss)
@@ -0,0 +1,80 @@
+'''
+Module of the parallel evaluation of the interchanges of a solution with the candidate points.
+'''
+
+from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+import numpy as np
+
+from models import PDPInstance
+from .evaluator import SwapEvaluator
+
+# instance of the processes of the pool, attached to the shared distances
+_instance: PDPInstance = None
+
+def _set_instance(instance: PDPInstance):
+    '''
+    Initializer of the processes of the pool.
+
+    The instance is dropped when the process exits, so it detaches from the shared distances.
+    '''
+    global _instance
+    _instance = instance
+    if instance is not None:
+        util.Finalize(None, _set_instance, args=(None,), exitpriority=0)
+
+def best_of_chunk(indexes: np.ndarray, removals: List[Tuple[int, np.ndarray]],
+                  candidates: np.ndarray) -> Tuple[int, int, int]:
+    '''
+    Returns the best objective function value of the interchanges of the candidates
+    with the points of the removals, the position of its candidate, the first one in case of ties,
+    and the position of its removal, the first one that gives the value.
+    '''
+    distances_from = _instance.distances[candidates[:, np.newaxis], indexes[np.newaxis, :]]
+    values = np.stack([SwapEvaluator.combine_many(removal, distances_from) for removal in removals])
+    best = values.max(axis=0)
+    k = int(np.argmax(best))
+    return (int(best[k]), k, int(np.argmax(values[:, k])))
+
+class CandidatePool:
+    '''
+    Pool of processes that evaluate the interchanges with chunks of the candidate points
+    in parallel, over the distances of an instance that must be shared meanwhile.
+
+    Use it as a context manager to shut the processes down.
+    '''
+
+    def __init__(self, instance: PDPInstance, jobs: int):
+        self.__jobs = jobs
+        self.__executor = ProcessPoolExecutor(jobs, initializer=_set_instance, initargs=(instance,))
+
+    def best(self, evaluator: SwapEvaluator, removed: List[int],
+             candidates: np.ndarray) -> Tuple[int, int, int]:
+        '''
+        Returns the best objective function value of the interchanges of the candidates
+        with the removed points, the position of its candidate and the position of its removed point,
+        breaking ties as a serial evaluation would: the first candidate and then the first point.
+        '''
+        removals = [evaluator.removal(x) for x in removed]
+        chunks = [chunk for chunk in np.array_split(candidates, self.__jobs) if len(chunk)]
+        futures = [
+            self.__executor.submit(best_of_chunk, evaluator.indexes, removals, chunk)
+            for chunk in chunks
+        ]
+        # the best of the chunks, the first one in case of ties
+        best, k, position = -1, 0, 0
+        offset = 0
+        for chunk, future in zip(chunks, futures):
+            value, chunk_k, chunk_position = future.result()
+            if value > best:
+                best, k, position = value, offset + chunk_k, chunk_position
+            offset += len(chunk)
+        return (best, k, position)
+
+    def __enter__(self) -> 'CandidatePool':
+        return self
+
+    def __exit__(self, *_):
+        self.__executor.shutdown()
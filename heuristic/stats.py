@@ -0,0 +1,67 @@
+'''
+Module of the instrumentation of the local search heuristics.
+'''
+
+import json
+import timeit
+from typing import Dict, List, TextIO, Tuple
+
+class SearchStats:
+    '''
+    Counters of a local search:
+
+    iterations: iterations of its main loop.
+
+    evaluations: objective function values evaluated for interchanges.
+
+    swaps: interchanges performed.
+
+    candidates: candidate points outside the solution scanned.
+
+    Also keeps its convergence trace, the (elapsed seconds, iteration, objective)
+    of the received solution and of each improvement, in memory until it's written.
+    '''
+
+    def __init__(self):
+        self.iterations = 0
+        self.evaluations = 0
+        self.swaps = 0
+        self.candidates = 0
+        self.trace: List[Tuple[float, int, int]] = []
+        self.__start = timeit.default_timer()
+
+    def start(self, objective: int):
+        '''
+        Starts the clock with the objective function value of the received solution.
+        '''
+        self.__start = timeit.default_timer()
+        self.trace.append((0.0, self.iterations, objective))
+
+    def improve(self, objective: int):
+        '''
+        Counts an interchange that improved the solution to the objective function value.
+        '''
+        self.swaps += 1
+        self.trace.append((timeit.default_timer() - self.__start, self.iterations, objective))
+
+    def counters(self) -> Dict[str, int]:
+        '''
+        Returns the counters by name.
+        '''
+        return {
+            'iterations': self.iterations,
+            'evaluations': self.evaluations,
+            'swaps': self.swaps,
+            'candidates': self.candidates
+        }
+
+    def write_trace(self, file: TextIO, **labels):
+        '''
+        Writes the trace to a file as JSON lines, with the labels (e.g. the instance) in each line,
+        in a single write, so processes appending to the same file don't mix their lines.
+        '''
+        file.write(''.join(
+            json.dumps({**labels, 'elapsed': elapsed, 'iteration': iteration, 'objective': objective}) + '\n'
+            for elapsed, iteration, objective in self.trace
+        ))
+        file.flush()
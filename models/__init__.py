@@ -1,8 +1,10 @@
 '''
 Package that contains the models of the project.
-These models are the classes of Point and PDPInstance.
+These models are the classes of Point and PDPInstance,
+and the storages of the distances matrix.
 '''
 
 # package level imports
 from .point import Point
 from .pdp_instance import PDPInstance, Matrix, Solution
+from .distances import CondensedMatrix, LazyMatrix
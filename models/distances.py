@@ -0,0 +1,242 @@
+'''
+Module for the storages of the distances between the candidate points of an instance.
+
+Every storage is indexed like a NumPy array of shape (n, n):
+
+distances[i, j]: distance between the points i and j.
+
+distances[rows, columns]: distances between the pairs of points given by two
+arrays of indexes, element by element.
+
+distances[i]: array of the distances from the point i to every point.
+'''
+
+from collections import OrderedDict, namedtuple
+from typing import Tuple
+
+import numpy as np
+
+# statistics of the rows cache of a LazyMatrix, like functools.lru_cache's
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+def truncated_distances(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> np.ndarray:
+    '''
+    Euclidean distances between the points (x1, y1) and (x2, y2), element by element,
+    truncated to integers as Point.distance would be by int().
+    '''
+    dx = x1 - x2
+    dy = y1 - y2
+    return np.sqrt(dx * dx + dy * dy).astype(np.int32)
+
+class CondensedMatrix:
+    '''
+    Symmetric matrix of distances with a zero diagonal that stores only its upper triangle,
+    the n(n - 1) / 2 distances d(i, j) with i < j in row-major order, in a flat array.
+    '''
+
+    def __init__(self, n: int, data: np.ndarray):
+        self.__n = n
+        self.__data = data
+        # position in data of the first element of each row, the pair (i, i + 1)
+        rows = np.arange(n, dtype=np.int64)
+        self.__starts = rows * n - rows * (rows + 1) // 2
+
+    @classmethod
+    def from_coordinates(cls, coordinates: np.ndarray):
+        '''
+        Computes the condensed matrix from an array of shape (n, 2) of coordinates (x, y),
+        one row at a time so the full matrix never exists.
+        '''
+        n = len(coordinates)
+        x = coordinates[:, 0]
+        y = coordinates[:, 1]
+        data = np.empty(n * (n - 1) // 2, dtype=np.int32)
+        start = 0
+        for i in range(n - 1):
+            end = start + n - i - 1
+            data[start:end] = truncated_distances(x[i], y[i], x[i + 1:], y[i + 1:])
+            start = end
+
+        return cls(n, data)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        '''
+        Shape of the represented matrix.
+        '''
+        return (self.__n, self.__n)
+
+    @property
+    def data(self) -> np.ndarray:
+        '''
+        Flat array of the upper triangle.
+        '''
+        return self.__data
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        Bytes used by the stored distances.
+        '''
+        return self.__data.nbytes
+
+    def __len__(self) -> int:
+        return self.__n
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            # a single pair
+            if np.ndim(i) == 0 and np.ndim(j) == 0:
+                if i == j:
+                    return self.__data.dtype.type(0)
+                if i > j:
+                    i, j = j, i
+                return self.__data[self.__starts[i] + j - i - 1]
+            return self.__pairs(np.asarray(i), np.asarray(j))
+        return self.row(key)
+
+    def __pairs(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        '''
+        Distances between the pairs (i, j) of two broadcastable arrays of indexes.
+        '''
+        low = np.minimum(i, j)
+        high = np.maximum(i, j)
+        same = low == high
+        # the diagonal has no position in data, point it to any valid one
+        positions = np.where(same, 0, self.__starts[low] + high - low - 1)
+        return np.where(same, 0, self.__data[positions]).astype(self.__data.dtype)
+
+    def row(self, i: int) -> np.ndarray:
+        '''
+        Distances from the point i to every point.
+        '''
+        n = self.__n
+        row = np.empty(n, dtype=self.__data.dtype)
+        row[i] = 0
+        # the part right of the diagonal is contiguous in data
+        start = self.__starts[i]
+        row[i + 1:] = self.__data[start:start + n - i - 1]
+        # the part left of the diagonal is column i of the upper triangle
+        previous = np.arange(i)
+        row[:i] = self.__data[self.__starts[previous] + i - previous - 1]
+        return row
+
+    def argmax(self) -> Tuple[int, int]:
+        '''
+        Returns the pair (i, j), i < j, of the first maximum distance in row-major order.
+        '''
+        position = int(np.argmax(self.__data))
+        i = int(np.searchsorted(self.__starts, position, side='right')) - 1
+        j = position - int(self.__starts[i]) + i + 1
+        return (i, j)
+
+    def tolist(self):
+        '''
+        Returns the full matrix as a list of lists.
+        '''
+        return [self.row(i).tolist() for i in range(self.__n)]
+
+class LazyMatrix:
+    '''
+    Matrix of distances that is never stored, they are computed from the coordinates when needed.
+
+    Pairs of distances are computed directly, and whole rows are kept in
+    a cache of at most cache_size rows that discards the least recently used one.
+    '''
+
+    def __init__(self, coordinates: np.ndarray, cache_size: int = 256):
+        self.__n = len(coordinates)
+        self.__x = coordinates[:, 0]
+        self.__y = coordinates[:, 1]
+        self.__cache_size = cache_size
+        self.__rows = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        '''
+        Shape of the represented matrix.
+        '''
+        return (self.__n, self.__n)
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        Bytes used by the cached rows.
+        '''
+        return sum(row.nbytes for row in self.__rows.values())
+
+    def __len__(self) -> int:
+        return self.__n
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            distances = truncated_distances(self.__x[i], self.__y[i], self.__x[j], self.__y[j])
+            # a single pair
+            if np.ndim(distances) == 0:
+                return distances[()]
+            return distances
+        return self.row(key)
+
+    def row(self, i: int) -> np.ndarray:
+        '''
+        Distances from the point i to every point, from the cache if possible.
+        '''
+        i = int(i)
+        row = self.__rows.get(i)
+        if row is not None:
+            self.__hits += 1
+            self.__rows.move_to_end(i)
+            return row
+
+        self.__misses += 1
+        row = truncated_distances(self.__x[i], self.__y[i], self.__x, self.__y)
+        # the cached rows are shared, prevent them from being modified
+        row.flags.writeable = False
+        if self.__cache_size > 0:
+            self.__rows[i] = row
+            if len(self.__rows) > self.__cache_size:
+                # discard the least recently used row
+                self.__rows.popitem(last=False)
+        return row
+
+    def cache_info(self) -> CacheInfo:
+        '''
+        Returns the hits, misses, maximum size and current size of the rows cache.
+        '''
+        return CacheInfo(self.__hits, self.__misses, self.__cache_size, len(self.__rows))
+
+    def cache_clear(self):
+        '''
+        Empties the rows cache and resets its statistics.
+        '''
+        self.__rows.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def argmax(self) -> Tuple[int, int]:
+        '''
+        Returns the pair (i, j), i < j, of the first maximum distance in row-major order.
+
+        The rows are computed one at a time without going through the cache.
+        '''
+        best = (-1, 0, 0)
+        for i in range(self.__n - 1):
+            row = truncated_distances(self.__x[i], self.__y[i], self.__x[i + 1:], self.__y[i + 1:])
+            j = int(np.argmax(row))
+            if row[j] > best[0]:
+                best = (row[j], i, i + 1 + j)
+
+        return best[1:]
+
+    def tolist(self):
+        '''
+        Returns the full matrix as a list of lists.
+        '''
+        return [
+            truncated_distances(self.__x[i], self.__y[i], self.__x, self.__y).tolist()
+            for i in range(self.__n)
+        ]
@@ -0,0 +1,130 @@
+'''
+Module of computational geometry over the coordinates of the points of an instance.
+'''
+
+from math import isqrt
+from typing import List, Tuple
+
+import numpy as np
+
+def cross(o: Tuple[int, int], a: Tuple[int, int], b: Tuple[int, int]) -> int:
+    '''
+    Cross product of the vectors OA and OB,
+    positive if O, A, B make a counterclockwise turn.
+    '''
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+def discard_interior(coordinates: np.ndarray) -> np.ndarray:
+    '''
+    Returns the indexes of the points that are not strictly inside the polygon of the
+    extreme points in 8 directions, the only ones that can be in the convex hull
+    (Akl-Toussaint heuristic).
+    '''
+    x = coordinates[:, 0]
+    y = coordinates[:, 1]
+    # the extremes in the directions of 180, 225, ..., 135 degrees, in counterclockwise order
+    projections = (-x, -x - y, -y, x - y, x, x + y, y, y - x)
+    corners = []
+    for projection in projections:
+        corner = int(np.argmax(projection))
+        if not corners or corner != corners[-1]:
+            corners.append(corner)
+    if len(corners) > 1 and corners[0] == corners[-1]:
+        corners.pop()
+    # there is no polygon
+    if len(corners) < 3:
+        return np.arange(len(coordinates))
+
+    inside = np.ones(len(coordinates), dtype=bool)
+    for k, corner in enumerate(corners):
+        (ox, oy), (ax, ay) = coordinates[corner], coordinates[corners[(k + 1) % len(corners)]]
+        inside &= (ax - ox) * (y - oy) - (ay - oy) * (x - ox) > 0
+
+    return np.flatnonzero(~inside)
+
+def convex_hull(coordinates: np.ndarray) -> List[int]:
+    '''
+    Returns the indexes of the vertices of the convex hull of the points in counterclockwise order,
+    without collinear points, by Andrew's monotone chain algorithm in O(n log n).
+    '''
+    candidates = discard_interior(coordinates)
+    x = coordinates[candidates, 0]
+    y = coordinates[candidates, 1]
+    # sort by x and then by y
+    order = candidates[np.lexsort((y, x))].tolist()
+    points = {i: (int(coordinates[i, 0]), int(coordinates[i, 1])) for i in order}
+    if len(order) < 3:
+        return order
+
+    def chain(indexes):
+        hull = []
+        for i in indexes:
+            while len(hull) >= 2 and cross(points[hull[-2]], points[hull[-1]], points[i]) <= 0:
+                hull.pop()
+            hull.append(i)
+        return hull
+
+    lower = chain(order)
+    upper = chain(reversed(order))
+    # the last point of each chain is the first of the other one
+    hull = lower[:-1] + upper[:-1]
+    # if all the points are the same
+    if not hull:
+        return order[:1]
+    return hull
+
+def farthest_pair(coordinates: np.ndarray) -> Tuple[int, int]:
+    '''
+    Returns the indexes (i, j), i < j, of the diameter of the points,
+    the two points that are the farthest apart, by rotating calipers over the convex hull
+    in O(n log n). Finding the first pair in case of ties takes O(nh) with memory O(n),
+    where h is the number of vertices of the hull, plus a scan row by row of the points
+    that can be in one of those pairs, usually a few.
+
+    Distances are compared truncated to integers like in the distances matrix,
+    and ties are broken by the smallest indexes, as the first maximum of the matrix in row-major order.
+    '''
+    hull = convex_hull(coordinates)
+    h = len(hull)
+    points = [(int(coordinates[i, 0]), int(coordinates[i, 1])) for i in hull]
+
+    def squared(a: int, b: int) -> int:
+        dx = points[a][0] - points[b][0]
+        dy = points[a][1] - points[b][1]
+        return dx * dx + dy * dy
+
+    # antipodal pairs of vertices of the hull
+    if h <= 3:
+        pairs = [(a, b) for a in range(h) for b in range(a + 1, h)] or [(0, 0)]
+    else:
+        pairs = []
+        b = 1
+        for a in range(h):
+            following = (a + 1) % h
+            # move the opposite caliper while the area of the triangle grows
+            while (cross(points[a], points[following], points[(b + 1) % h])
+                   > cross(points[a], points[following], points[b])):
+                b = (b + 1) % h
+            pairs.append((a, b))
+            pairs.append((following, b))
+            # an edge parallel to this one has two antipodal vertices
+            if (cross(points[a], points[following], points[(b + 1) % h])
+                    == cross(points[a], points[following], points[b])):
+                pairs.append((a, (b + 1) % h))
+                pairs.append((following, (b + 1) % h))
+
+    maximum = isqrt(max(squared(a, b) for a, b in pairs))
+    # other pairs, even of points not in the hull, may be at the same truncated distance,
+    # and a point can only be in one if its farthest point, a vertex of the hull, is at that distance
+    coordinates = coordinates.astype(np.int64)
+    farthest = np.zeros(len(coordinates), dtype=np.int64)
+    for x, y in points:
+        np.maximum(farthest, (coordinates[:, 0] - x) ** 2 + (coordinates[:, 1] - y) ** 2, out=farthest)
+    candidates = np.flatnonzero(farthest >= maximum * maximum)
+    # the first pair in row-major order, as a scan of the distances matrix finds,
+    # the point with the smallest index that is in one and its first partner
+    for k, i in enumerate(candidates):
+        following = candidates[k:]
+        reaches = ((coordinates[following] - coordinates[i]) ** 2).sum(axis=1) >= maximum * maximum
+        if reaches.any():
+            return (int(i), int(following[np.argmax(reaches)]))
@@ -2,49 +2,94 @@
 Module for the class of a PDP's Instance.
 '''
 
-from typing import List, Tuple
-from random import randint
+from typing import List, Optional, Tuple, Union
+import random
+
+import numpy as np
 
 from .point import Point
+from .distances import CondensedMatrix, LazyMatrix, truncated_distances
+from .geometry import farthest_pair
+from .shared import SharedArray, publish, attach, release
 
-Matrix = List[List[int]]
+Matrix = Union[np.ndarray, CondensedMatrix, LazyMatrix]
 Solution = List[Point]
 
+# storages of the distances
+STORAGES = ('full', 'condensed', 'lazy')
+
 class PDPInstance:
     '''
     Instance for the PDP containing:
 
     p: number of points to select from n.
 
-    points: list of n Point objects.
+    points: list of n Point objects, or None to make them from the coordinates when needed.
 
     distances_flag: whether or not to calculate the distances matrix.
     Set this to False when writing the instance.
+
+    storage: how the distances are stored,
+    'full' is the n * n matrix, 'condensed' only its upper triangle
+    and 'lazy' computes them from the coordinates when needed.
+
+    cache_size: rows of distances cached by the 'lazy' storage.
+
+    coordinates: array of shape (n, 2) with the coordinates of the points,
+    given instead of the points or to avoid computing them from the points.
+
+    The distances can be moved to shared memory with share(), so the processes
+    this instance is sent to attach to them instead of receiving a copy:
+
+    with instance.share():
+        executor.map(function, repeat(instance, times))
     '''
 
-    def __init__(self, p: int, points: List[Point], distances_flag: bool = True):
-        self.__n = len(points)
+    def __init__(self, p: int, points: Optional[List[Point]], distances_flag: bool = True, storage: str = 'full',
+                 cache_size: int = 256, coordinates: np.ndarray = None):
+        if storage not in STORAGES:
+            raise ValueError(f'invalid storage {repr(storage)}, must be one of {STORAGES}')
+        if coordinates is None:
+            coordinates = np.array([(point.x, point.y) for point in points], dtype=np.int64).reshape(-1, 2)
+        self.__coordinates = np.asarray(coordinates, dtype=np.int64)
+        self.__n = len(self.__coordinates)
         self.__p = p
         self.__points = points
+        self.__storage = storage
+        self.__cache_size = cache_size
         if distances_flag:
             self.__distances = self.__get_distances()
         else:
-            self.__distances = [[0]]
+            self.__distances = np.zeros((1, 1), dtype=np.int32)
+        # block of shared memory of the distances, its descriptor
+        # and whether this instance created it
+        self.__block = None
+        self.__descriptor: SharedArray = None
+        self.__owner = False
+        # whether each share() that wasn't exited yet moved the distances,
+        # so only the outermost 'with' releases them
+        self.__shares: List[bool] = []
 
     @classmethod
-    def random(cls, n: int, p: int, x_max: int, y_max: int):
-        '''
-        Constructs a random PDP Instance.
+    def random(cls, n: int, p: int, x_max: int, y_max: int, seed: int = None):
         '''
-        # prevent coordinates to repeat
-        coords = set()
-        while len(coords) < n:
-            coords |= set((randint(0, x_max), randint(0, y_max)) for _ in range(n - len(coords)))
+        Constructs a random PDP Instance, with n points in different cells
+        of the grid of coordinates from (0, 0) to (x_max, y_max).
 
-        # generate points from unique coordinates
-        points = [Point(i, x, y) for i, (x, y) in enumerate(coords)]
+        seed: seed of the random generator, if not given it's drawn from the random module,
+        so random.seed() makes the instance reproducible too.
+        '''
+        cells = (x_max + 1) * (y_max + 1)
+        if n > cells:
+            raise ValueError(f'there are only {cells} different coordinates, not {n}')
+        if seed is None:
+            seed = random.getrandbits(64)
+        # prevent coordinates to repeat, sampling the cells without replacement in random order
+        sampled = np.random.default_rng(seed).choice(cells, n, replace=False)
+        coordinates = np.stack(np.divmod(sampled, y_max + 1), axis=1)
 
-        return cls(p, points, False)
+        # the points are generated from the unique coordinates when needed
+        return cls(p, None, False, coordinates=coordinates)
 
     @property
     def n(self) -> int:
@@ -63,47 +108,150 @@ class PDPInstance:
     @property
     def points(self) -> List[Point]:
         '''
-        Candidate points.
+        Candidate points, indexed by their positions if they are made from the coordinates.
         '''
+        if self.__points is None:
+            self.__points = [Point(i, x, y) for i, (x, y) in enumerate(self.coordinates.tolist())]
         return self.__points
 
+    @property
+    def coordinates(self) -> np.ndarray:
+        '''
+        Array of shape (n, 2) with the coordinates (x, y) of the candidate points.
+        '''
+        return self.__coordinates
+
+    @property
+    def storage(self) -> str:
+        '''
+        How the distances are stored.
+        '''
+        return self.__storage
+
     @property
     def distances(self) -> Matrix:
         '''
-        Matrix of Euclidean distances of the candidate points.
+        Matrix of Euclidean distances of the candidate points,
+        indexed as distances[i, j] whatever the storage.
         '''
         return self.__distances
 
     def __get_distances(self) -> Matrix:
         '''
         Gets the distances matrix of the candidate points.
+
+        The distances are truncated to integers, as Point.distance would be by int().
+        '''
+        if self.storage == 'condensed':
+            return CondensedMatrix.from_coordinates(self.coordinates)
+        if self.storage == 'lazy':
+            return LazyMatrix(self.coordinates, self.__cache_size)
+
+        x = self.coordinates[:, 0]
+        y = self.coordinates[:, 1]
+        # distance from every point i (rows) to every point j (columns),
+        # the diagonal (distance of same point) is 0
+        return truncated_distances(x[:, np.newaxis], y[:, np.newaxis], x[np.newaxis, :], y[np.newaxis, :])
+
+    def set_distances(self, distances: Matrix = None):
+        '''
+        Set the distances matrix, computing it if it's not given.
         '''
-        return [
-            [
-                # Euclidean distance from point i to point j
-                int(self.points[i].distance(self.points[j]))
-                # if it's distance of same city put 0
-                if i != j else 0
-                # for each column
-                for j in range(len(self.points))
-            ]
-            # for each row
-            for i in range(len(self.points))
-        ]
+        if distances is None:
+            distances = self.__get_distances()
+        self.__distances = distances
 
-    def set_distances(self):
+    @property
+    def shared(self) -> bool:
+        '''
+        Whether the distances are in shared memory.
+        '''
+        return self.__descriptor is not None
+
+    def share(self) -> 'PDPInstance':
+        '''
+        Moves the distances to a block of shared memory owned by this instance,
+        until it's released. The 'lazy' storage has nothing to share.
+
+        Returns the instance, to be used as a context manager that releases it
+        if the distances were moved by this call.
+        '''
+        self.__shares.append(not self.shared and self.storage != 'lazy')
+        if not self.__shares[-1]:
+            return self
+        data = self.distances if self.storage == 'full' else self.distances.data
+        self.__block, array, self.__descriptor = publish(np.asarray(data))
+        self.__owner = True
+        self.__set_shared(array)
+        return self
+
+    def release(self):
+        '''
+        Moves the distances back to the memory of this process and releases
+        the shared memory, which is freed if this instance is its owner,
+        once the arrays and views of the shared distances are collected.
+        '''
+        if not self.shared:
+            return
+        data = self.distances if self.storage == 'full' else self.distances.data
+        self.__set_shared(np.array(data))
+        release(self.__block, self.__owner)
+        self.__block = None
+        self.__descriptor = None
+        self.__owner = False
+
+    def __set_shared(self, array: np.ndarray):
         '''
-        Set the distances matrix.
+        Sets the distances from the array of the shared ones.
         '''
-        self.__distances = self.__get_distances()
+        if self.storage == 'full':
+            self.__distances = array
+        else:
+            self.__distances = CondensedMatrix(self.n, array)
+
+    def __enter__(self) -> 'PDPInstance':
+        return self
+
+    def __exit__(self, *_):
+        if self.__shares and self.__shares.pop():
+            self.release()
+
+    def __getstate__(self) -> dict:
+        '''
+        Pickles the descriptor of the shared distances instead of the distances.
+        '''
+        state = self.__dict__.copy()
+        state['_PDPInstance__shares'] = []
+        if self.shared:
+            state['_PDPInstance__distances'] = None
+            state['_PDPInstance__block'] = None
+            state['_PDPInstance__owner'] = False
+        return state
 
-    def get_farthest_points(self) -> Tuple[Point, Point]:
+    def __setstate__(self, state: dict):
         '''
-        Returns the two points that are the farthest according to the distances matrix.
+        Attaches to the shared distances when unpickled.
         '''
-        maximums = (max(enumerate(row), key=lambda r: r[1]) for row in self.distances)
-        farthest = max(enumerate(maximums), key=lambda m: m[1][1])
-        i, j = farthest[0], farthest[1][0]
+        self.__dict__.update(state)
+        if self.shared:
+            self.__block, array = attach(self.__descriptor)
+            self.__set_shared(array)
+
+    def get_farthest_points(self, geometric: bool = True) -> Tuple[Point, Point]:
+        '''
+        Returns the two points that are the farthest.
+
+        geometric: whether to find them from the coordinates in O(n log n),
+        or else by scanning the distances matrix in O(n^2),
+        what is needed if the distances are not the Euclidean ones of the coordinates.
+        '''
+        if geometric and self.n >= 2:
+            i, j = farthest_pair(self.coordinates)
+        # the first maximum in row-major order
+        elif self.storage == 'full':
+            i, j = np.unravel_index(np.argmax(self.distances), self.distances.shape)
+        else:
+            i, j = self.distances.argmax()
 
         return (self.points[i], self.points[j])
 
@@ -111,4 +259,6 @@ class PDPInstance:
         '''
         Returns a string representing the body (the Points) of the instance's file.
         '''
+        if self.__points is None:
+            return '\n'.join(f'{i} {x} {y}' for i, (x, y) in enumerate(self.coordinates.tolist()))
         return '\n'.join([str(p) for p in self.points])
@@ -0,0 +1,68 @@
+'''
+Module for sharing arrays between processes through named blocks of shared memory.
+
+A process publishes an array into a new block and owns it, the other processes
+attach to the block by its descriptor and use the array without copying it.
+The owner must unlink the block when no process needs it anymore.
+
+Each process detaches from a block once the array backed by it, and every view of it,
+is collected, as closing the block before unmaps the memory they read.
+'''
+
+import weakref
+from multiprocessing import shared_memory
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+class SharedArray(NamedTuple):
+    '''
+    Descriptor of an array in a block of shared memory, cheap to send to another process.
+    '''
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+def publish(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, np.ndarray, SharedArray]:
+    '''
+    Copies an array into a new block of shared memory.
+
+    Returns the block, the array backed by it and its descriptor.
+    '''
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    close_when_collected(shared, block)
+    return (block, shared, SharedArray(block.name, array.shape, array.dtype.str))
+
+def attach(descriptor: SharedArray) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    '''
+    Attaches to the block of shared memory of a descriptor.
+
+    Returns the block and the read-only array backed by it.
+    '''
+    # the workers started by the owner share its resource tracker,
+    # which unlinks the block only if the owner ends without doing it
+    block = shared_memory.SharedMemory(name=descriptor.name)
+    array = np.ndarray(descriptor.shape, dtype=np.dtype(descriptor.dtype), buffer=block.buf)
+    array.flags.writeable = False
+    close_when_collected(array, block)
+    return (block, array)
+
+def close_when_collected(array: np.ndarray, block: shared_memory.SharedMemory):
+    '''
+    Closes a block of shared memory once the array backed by it is collected.
+    '''
+    finalizer = weakref.finalize(array, block.close)
+    # at exit the memory is unmapped anyway, and the array may still be used meanwhile
+    finalizer.atexit = False
+
+def release(block: shared_memory.SharedMemory, owner: bool):
+    '''
+    Unlinks a block of shared memory if this process is the owner, so no other process
+    can attach to it. This process detaches from it once its array is collected.
+
+    The memory is freed once every process has detached from it.
+    '''
+    if owner:
+        block.unlink()
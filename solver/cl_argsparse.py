@@ -8,16 +8,22 @@ The parsed arguments are then used in other module to solve the specified instan
 
 import sys
 import argparse
-from typing import Tuple
+from typing import Optional, Tuple
 
 from validations import is_valid_n, is_positive_int, is_time
 
-def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int, int]:
+def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, bool, float, str, bool, int,
+                               Optional[Tuple[int, Optional[int], Optional[float]]], int, bool, Optional[str],
+                               bool, Optional[str], Optional[float], Optional[float], int]:
     '''
     An ArgumentParser object receives arguments from the command line
-    and solves a PDP instance and returns a tuple of 4 elements:
+    to solve PDP instances and returns them in a tuple of 18 elements.
 
-    (size: int, instances: int, heuristics: Tuple[int, int], verbose: int)
+    (size: int, instances: int, heuristics: Tuple[int, int], verbose: int, save_results: bool,
+    time: float, storage: str, cache: bool, jobs: int,
+    grasp: Optional[Tuple[int, Optional[int], Optional[float]]], workers: int, profile: bool,
+    pstats: Optional[str], counters: bool, trace: Optional[str], time_limit: Optional[float],
+    exact: Optional[float], cache_size: int)
 
     If no arguments are given the program will end.
     '''
@@ -45,13 +51,14 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int, int]:
         nargs=2,
         metavar=('constructive', 'localsearch'),
         type=int,
-        choices=(0, 1, 2),
+        choices=(0, 1, 2, 3),
         help='''heuristics to use,
         the solution given by the constructive will be sent to the local search.
         
         Constructives: 1 = Greedy construction (GC).
         
-        Local search: 1 = First pairwise interchange (IF), 2 = Best pairwase interchange (IM).
+        Local search: 1 = First pairwise interchange (IF), 2 = Best pairwase interchange (IM),
+        3 = Full swap interchange (IS).
         
         If the constructive option is 0, the local search will receive a random solution'''
     )
@@ -83,6 +90,105 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int, int]:
         help='''pause in seconds between plots,
             default to 0 meaning that a click or key press is needed to replot'''
     )
+    optional.add_argument(
+        '-st', '--storage',
+        type=str,
+        default='full',
+        choices=('full', 'condensed', 'lazy'),
+        help='''how to store the distances matrix:
+            full = the n * n matrix (default).
+            condensed = only its upper triangle, using half the memory.
+            lazy = no matrix, distances are computed when needed and recent rows are cached.'''
+    )
+    optional.add_argument(
+        '-cs', '--cache-size',
+        metavar='N',
+        type=is_positive_int,
+        default=256,
+        help='rows of distances cached by the lazy storage, default to 256'
+    )
+    optional.add_argument(
+        '-nc', '--no-cache',
+        action='store_true',
+        help='''compute the distances matrix of every instance instead of
+            loading it from the cache next to its file, default to False'''
+    )
+    optional.add_argument(
+        '-j', '--jobs',
+        metavar='N',
+        type=is_positive_int,
+        default=1,
+        help='''number of processes to solve the instances in parallel, default to 1.
+            The output and the results keep the order of the instances'''
+    )
+    optional.add_argument(
+        '-w', '--workers',
+        metavar='N',
+        type=is_positive_int,
+        default=1,
+        help='''number of processes to evaluate the candidates of each instance in parallel
+            in the local search IM, default to 1'''
+    )
+    optional.add_argument(
+        '-tl', '--time-limit',
+        metavar='s',
+        type=is_time,
+        help='''seconds to solve each instance by the heuristics,
+            if they run out the best solution found so far is kept'''
+    )
+    optional.add_argument(
+        '-g', '--grasp',
+        metavar='k',
+        type=is_positive_int,
+        help='''solve by GRASP, repeating the constructive randomized with a restricted
+            candidate list of size k and the local search until --starts or --budget runs out.
+            The starts are run in parallel by --jobs processes, solving the instances one by one'''
+    )
+    optional.add_argument(
+        '-s', '--starts',
+        metavar='N',
+        type=is_positive_int,
+        help='maximum number of starts of GRASP for each instance'
+    )
+    optional.add_argument(
+        '-b', '--budget',
+        metavar='s',
+        type=is_time,
+        help='maximum seconds of GRASP for each instance'
+    )
+    optional.add_argument(
+        '-e', '--exact',
+        metavar='s',
+        type=is_time,
+        help='''solve each instance to optimality by binary search over its distances,
+            starting from the solution of the heuristics, for at most s seconds.
+            If they run out, the bounds of the optimal objective found so far are output'''
+    )
+    optional.add_argument(
+        '-p', '--profile',
+        action='store_true',
+        help='''output the time of each phase of solving the instances:
+            read, distances, constructive, local search, bound, exact and write (the CSV file)'''
+    )
+    optional.add_argument(
+        '-ps', '--pstats',
+        metavar='DIR',
+        help='''profile the phases with cProfile and dump their statistics
+            to DIR/<phase>.pstats, implies --profile. Only with 1 job'''
+    )
+    optional.add_argument(
+        '-c', '--counters',
+        action='store_true',
+        help='''output the counters of the local search of each instance:
+            iterations, objective evaluations, swaps and candidates scanned'''
+    )
+    optional.add_argument(
+        '-tr', '--trace',
+        metavar='FILE',
+        help='''write the convergence trace of the local search of each instance to FILE as JSON lines
+            of its instance, heuristic, elapsed seconds, iteration and objective,
+            at the start and after each improvement'''
+    )
     optional.add_argument(
         '-v', '--verbose',
         type=int,
@@ -104,6 +210,39 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int, int]:
     # parse arguments from command line
     arguments = parser.parse_args()
 
+    if arguments.jobs > 1 and arguments.verbose >= 2:
+        parser.error('argument -j/--jobs: plots can only be shown with 1 job (-v 2 or 3)')
+
+    constructive = arguments.heuristics[0]
+    if constructive > 1:
+        parser.error(f'argument -H/--heuristics: invalid constructive choice: {constructive} (choose from 0, 1)')
+
+    if arguments.grasp:
+        if constructive != 1 or not arguments.heuristics[1]:
+            parser.error('argument -g/--grasp: needs the constructive 1 and a local search')
+        if arguments.starts is None and arguments.budget is None:
+            parser.error('argument -g/--grasp: needs -s/--starts or -b/--budget')
+        grasp = (arguments.grasp, arguments.starts, arguments.budget)
+    else:
+        grasp = None
+
+    if arguments.grasp and arguments.time_limit is not None:
+        parser.error('argument -tl/--time-limit: not allowed with argument -g/--grasp, use -b/--budget')
+
+    if arguments.grasp and (arguments.counters or arguments.trace):
+        parser.error('arguments -c/--counters and -tr/--trace: not allowed with argument -g/--grasp')
+
+    if arguments.pstats is not None and arguments.jobs > 1 and not arguments.grasp:
+        parser.error('argument -ps/--pstats: not allowed with more than 1 job solving the instances')
+
+    if arguments.workers > 1:
+        if arguments.heuristics[1] != 2:
+            parser.error('argument -w/--workers: only the local search IM (2) can use workers')
+        if arguments.grasp:
+            parser.error('argument -w/--workers: not allowed with argument -g/--grasp')
+        if arguments.jobs > 1:
+            parser.error('argument -w/--workers: not allowed with more than 1 job')
+
     # if all instances will be solved
     if arguments.all:
         number = 20
@@ -118,5 +257,17 @@ def parse_arguments() -> Tuple[int, int, Tuple[int, int], int, int, int]:
         tuple(arguments.heuristics),
         arguments.verbose,
         arguments.save_results,
-        arguments.time
+        arguments.time,
+        arguments.storage,
+        not arguments.no_cache,
+        arguments.jobs,
+        grasp,
+        arguments.workers,
+        arguments.profile,
+        arguments.pstats,
+        arguments.counters,
+        arguments.trace,
+        arguments.time_limit,
+        arguments.exact,
+        arguments.cache_size
     )
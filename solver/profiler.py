@@ -0,0 +1,91 @@
+'''
+Module to measure the time of each phase of solving the instances.
+'''
+
+import os
+import cProfile
+import pstats
+import timeit
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+# phases of solving an instance, in order
+PHASES = ('read', 'distances', 'constructive', 'local search', 'bound', 'exact', 'write')
+
+class Profiler:
+    '''
+    Accumulates the time of each phase, and its cProfile statistics if dump_dir is given,
+    where they are dumped as <phase>.pstats.
+
+    A disabled profiler does nothing, so it can always be used.
+    '''
+
+    def __init__(self, enabled: bool = False, dump_dir: str = None):
+        self.__enabled = enabled or dump_dir is not None
+        self.__dump_dir = dump_dir
+        self.__times: Dict[str, float] = {}
+        self.__profiles: Dict[str, cProfile.Profile] = {}
+
+    @property
+    def enabled(self) -> bool:
+        '''
+        Whether the phases are measured.
+        '''
+        return self.__enabled
+
+    @property
+    def times(self) -> Dict[str, float]:
+        '''
+        Seconds of each phase measured so far.
+        '''
+        return self.__times
+
+    def phase(self, name: str):
+        '''
+        Returns a context manager that measures a phase.
+        '''
+        if not self.__enabled:
+            return nullcontext()
+        return self.__measure(name)
+
+    @contextmanager
+    def __measure(self, name: str):
+        profile = None
+        if self.__dump_dir is not None:
+            profile = self.__profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            self.add(name, timeit.default_timer() - start)
+            if profile is not None:
+                profile.disable()
+
+    def add(self, name: str, seconds: float):
+        '''
+        Adds seconds to a phase, as the ones measured by another process.
+        '''
+        self.__times[name] = self.__times.get(name, 0.0) + seconds
+
+    def report(self) -> List[str]:
+        '''
+        Returns the lines of the report of the time of each phase,
+        and dumps the statistics of each one.
+        '''
+        total = sum(self.__times.values()) or 1.0
+        lines = ['Profile:']
+        names = [name for name in PHASES if name in self.__times]
+        names += [name for name in self.__times if name not in PHASES]
+        for name in names:
+            seconds = self.__times[name]
+            lines.append(f'  {name:<13} {seconds:10.4f} s {seconds / total:7.1%}')
+
+        if self.__profiles:
+            if not os.path.exists(self.__dump_dir):
+                os.makedirs(self.__dump_dir)
+            for name, profile in self.__profiles.items():
+                filepath = os.path.join(self.__dump_dir, name.replace(' ', '_') + '.pstats')
+                pstats.Stats(profile).dump_stats(filepath)
+            lines.append(f'Statistics of each phase have been saved to {self.__dump_dir}.')
+        return lines
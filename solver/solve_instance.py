@@ -2,18 +2,50 @@
 Module to solve a PDP instance.
 '''
 
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 from statistics import mean
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import timeit
 import random
 
-from file_handling import list_files, read_instance, write_results
+from file_handling import list_files, read_instance, set_file_distances, write_results
 from heuristic.constructive import greedy_construction
-from heuristic.local_search import first_interchange, best_interchange
+from heuristic.local_search import first_interchange, best_interchange, swap_interchange
+from heuristic.grasp import grasp as run_grasp
 from heuristic.functions import objective_function
+from heuristic.stats import SearchStats
+from heuristic.budget import Budget
+from exact import solve_exact, upper_bound
 import models.plotter as mp
+from .profiler import Profiler
 
-def solve_instance(size: int, number: int, heuristics: Tuple[int, int], verbose: int, save: bool, time: float):
+# constructive heuristics
+ch_funcs = {
+    1: greedy_construction
+}
+ch_names = {
+    0: 'random',
+    1: 'GC'
+}
+# local search heuristics
+lsh_funcs = {
+    1: first_interchange,
+    2: best_interchange,
+    3: swap_interchange
+}
+lsh_names = {
+    0: '',
+    1: '_vs_IF',
+    2: '_vs_IM',
+    3: '_vs_IS'
+}
+
+def solve_instance(size: int, number: int, heuristics: Tuple[int, int], verbose: int, save: bool, time: float,
+                   storage: str = 'full', cache: bool = True, jobs: int = 1,
+                   grasp: Optional[Tuple[int, Optional[int], Optional[float]]] = None, workers: int = 1,
+                   profile: bool = False, pstats_dir: str = None, counters: bool = False, trace: str = None,
+                   time_limit: float = None, exact: float = None, cache_size: int = 256):
     '''
     Solves one or more PDP instances according to:
 
@@ -24,36 +56,52 @@ def solve_instance(size: int, number: int, heuristics: Tuple[int, int], verbose:
     heuristics: Which heuristics to use. The first element is a constructive,
     the second a local search.
 
-    save: whether or not to save experimental results in a CSV file.
+    save: whether or not to save experimental results in a CSV file,
+    with the gap of each instance between the objective of the heuristics and an upper bound of the optimum.
 
     verbose: Option to increase output information.
 
     time: pause in seconds between plots.
+
+    storage: how to store the distances matrix of each instance.
+
+    cache: whether or not to load the distances matrices from the cache of the files.
+
+    jobs: number of processes to solve the instances in parallel.
+    The output and the results keep the order of the files.
+
+    grasp: the size of the restricted candidate list, the maximum number of starts
+    and the budget of seconds to solve each instance by GRASP, if given.
+    Its results are the ones of the local search, compared with the constructive,
+    and the jobs run its starts in parallel instead of the instances.
+
+    workers: number of processes to evaluate the candidates of each instance in parallel in IM.
+
+    profile: whether or not to output the time of each phase of solving the instances
+    (read, distances, constructive, local search, bound, exact, write).
+
+    pstats_dir: directory to dump the cProfile statistics of each phase to, if any, with one job.
+
+    counters: whether or not to output the counters of the local search of each instance.
+
+    trace: path of a JSONL file to write the convergence trace of the local search
+    of each instance to, if any, see heuristic.stats.SearchStats.
+
+    time_limit: seconds to solve each instance by the heuristics, if any.
+    If they run out, the best solution found so far is kept.
+
+    exact: seconds to solve each instance to optimality from the solution of the heuristics, if any.
+    If they run out, the bounds of the optimal objective function value are output.
+
+    cache_size: rows of distances cached by the 'lazy' storage.
     '''
     files = list_files(size, number)
     if not files:
         return
+    if trace:
+        # the instances append their traces to the emptied file
+        open(trace, 'w').close()
 
-    # constructive heuristics
-    ch_funcs = {
-        1: greedy_construction
-    }
-    ch_names = {
-        0: 'random',
-        1: 'GC'
-    }
-    # local search heuristics
-    lsh_funcs = {
-        1: first_interchange,
-        2: best_interchange
-    }
-    lsh_names = {
-        0: '',
-        1: '_vs_IF',
-        2: '_vs_IM'
-    }
-
-    bool_verbose = verbose == 3
     mp.timeplot = time
     # get chosen constructive heuristic
     ch_key = heuristics[0]
@@ -65,69 +113,197 @@ def solve_instance(size: int, number: int, heuristics: Tuple[int, int], verbose:
     # initialize results with titles
     results = [
         ['Instance', 'CH OF', 'CH Time (s)', 'LSH OF', 'LSH Time (s)',
-         'Absolute improvement', 'Relative improvement']
+         'Absolute improvement', 'Relative improvement', 'Upper bound', 'Gap']
     ]
-    for filename in files:
-        # load instance from file
-        instance = read_instance(filename)
+    gaps = list()
+    profiler = Profiler(profile, pstats_dir)
+    solve = partial(
+        solve_file,
+        heuristics=heuristics, verbose=verbose, storage=storage, cache=cache,
+        buffered=jobs > 1 and grasp is None, grasp=grasp, jobs=jobs, workers=workers, profiler=profiler,
+        counters=counters, trace=trace, time_limit=time_limit, exact=exact,
+        cache_size=cache_size
+    )
+    if jobs > 1 and grasp is None:
+        executor = ProcessPoolExecutor(jobs)
+        # the results are yielded in the order of the files
+        experiments = executor.map(solve, files)
+    else:
+        executor = None
+        experiments = map(solve, files)
+
+    try:
+        for row, output, times in experiments:
+            # the output and the times of the phases of the instances solved by other processes
+            for line in output:
+                print(line)
+            for phase, seconds in times.items():
+                profiler.add(phase, seconds)
+            ch_of, lsh_of, rel_imp = row[1], row[3], row[6]
+            gaps.append(row[8])
+            row[8] = f'{row[8]:.3g}%'
+            # if the current experiment uses a CH and a LSH
+            if ch_key and lsh_key:
+                improvement_data.append(rel_imp)
+                if lsh_of > ch_of:
+                    improved_instances += 1
+                    row[6] = f'{rel_imp:.3g}%'
 
-        print()
+            results.append(row)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if ch_key and lsh_key:
+        print(f'Improved instances: {improved_instances}/{number}')
+        avg_rel_imp = f'{mean(improvement_data):.3g}%'
+        print(f'Avg relative: {avg_rel_imp}')
+        results.append(['Improved instances', '', '', '', '', improved_instances, '', '', ''])
+    else:
+        avg_rel_imp = ''
+    avg_gap = f'{mean(gaps):.3g}%'
+    print(f'Avg gap: {avg_gap}')
+    results.append(['Average', '', '', '', '', '', avg_rel_imp, '', avg_gap])
+
+    if save:
+        csv_name = f'{size}_{ch_names[ch_key]}{lsh_names[lsh_key]}{"_GRASP" if grasp else ""}.csv'
+        with profiler.phase('write'):
+            write_results(csv_name, results)
+        print(f'Experimental results have been saved to file {csv_name}.')
+
+    if profiler.enabled:
+        for line in profiler.report():
+            print(line)
+
+def solve_file(filename: str, heuristics: Tuple[int, int], verbose: int, storage: str, cache: bool,
+               buffered: bool, grasp: Optional[Tuple[int, Optional[int], Optional[float]]] = None,
+               jobs: int = 1, workers: int = 1,
+               profiler: Profiler = None, counters: bool = False,
+               trace: str = None, time_limit: float = None,
+               exact: float = None, cache_size: int = 256) -> Tuple[list, List[str], Dict[str, float]]:
+    '''
+    Solves the instance of a file with the chosen heuristics, measuring their times,
+    and then by GRASP with jobs processes if it's given instead of by the local search.
+    IM evaluates the candidates with workers processes.
+    The phases are measured by the profiler, if it's enabled.
+    The counters of the local search are output if counters is True,
+    and its convergence trace is appended to the file trace if it's given.
+    The heuristics stop when the time limit runs out, if it's given.
+    The instance is then solved to optimality for the exact seconds, if they're given.
+    The gap between the objective of the heuristics and an upper bound of the optimum is output,
+    the bound is the one proven by the exact algorithm if it runs.
+
+    Returns the row of the experiment's results, and its output and the times of its phases
+    if they are buffered instead of printed and measured by the profiler,
+    as when solving in another process.
+    '''
+    output = []
+    echo = output.append if buffered else print
+    bool_verbose = verbose == 3
+    ch_key, lsh_key = heuristics
+    if profiler is None:
+        profiler = Profiler()
+    elif buffered:
+        # the times are returned to the profiler of the main process
+        profiler = Profiler(profiler.enabled)
+
+    # load instance from file
+    with profiler.phase('read'):
+        instance = read_instance(filename, storage, cache, distances=False, cache_size=cache_size)
+    with profiler.phase('distances'):
+        set_file_distances(instance, filename, cache)
+
+    echo('')
+    # the time limit starts when the instance is ready to be solved
+    budget = Budget(time_limit)
+    with profiler.phase('constructive'):
         if ch_key:
             start = timeit.default_timer()
-            solution = ch_funcs[ch_key](instance, bool_verbose)
+            solution = ch_funcs[ch_key](instance, bool_verbose, budget=budget)
             ch_time = timeit.default_timer() - start
+            if not budget.converged:
+                echo('CH stopped by the time limit')
 
             ch_of = objective_function(solution, instance.distances)
-            print(f'CH OF = {ch_of}')
+            echo(f'CH OF = {ch_of}')
             ch_time = float(f'{ch_time:g}')
-            print(f'CH Time = {ch_time} s')
+            echo(f'CH Time = {ch_time} s')
         # if no constructive was chosen
         else:
             solution = random.sample(instance.points, instance.p)
             ch_of = ''
             ch_time = ''
 
-        if lsh_key:
-            start = timeit.default_timer()
-            solution = lsh_funcs[lsh_key](instance, solution, bool_verbose)
-            lsh_time = timeit.default_timer() - start
+    if lsh_key:
+        stats = SearchStats()
+        start = timeit.default_timer()
+        with profiler.phase('local search'):
+            if grasp:
+                rcl, starts, grasp_budget = grasp
+                solution, rate = run_grasp(instance, lsh_funcs[lsh_key], rcl, starts, grasp_budget, jobs)
+            elif workers > 1:
+                solution = best_interchange(instance, solution, bool_verbose, workers, stats, budget)
+            else:
+                solution = lsh_funcs[lsh_key](instance, solution, bool_verbose, stats=stats, budget=budget)
+        lsh_time = timeit.default_timer() - start
+        if not grasp and not budget.converged:
+            echo('LSH stopped by the time limit')
 
-            lsh_of = objective_function(solution, instance.distances)
-            print(f'LSH OF = {lsh_of}')
-            lsh_time = float(f'{lsh_time:g}')
-            print(f'LSH Time = {lsh_time} s')
+        lsh_of = objective_function(solution, instance.distances)
+        echo(f'LSH OF = {lsh_of}')
+        lsh_time = float(f'{lsh_time:g}')
+        echo(f'LSH Time = {lsh_time} s')
+        if grasp:
+            echo(f'GRASP starts/s = {rate:.3g}')
         else:
-            lsh_of = ''
-            lsh_time = ''
-
-        # if the current experiment uses a CH and a LSH
-        if ch_key and lsh_key:
-            abs_imp = lsh_of - ch_of
-            rel_imp = (abs_imp / ch_of) * 100
-            improvement_data.append(rel_imp)
-            if lsh_of > ch_of:
-                improved_instances += 1
-                print(f'Absoulte improvement: {abs_imp}')
-                rel_imp = f'{rel_imp:.3g}%'
-                print(f'Relative improvement: {rel_imp}')
+            if counters:
+                echo('LSH ' + ', '.join(f'{name} = {count}' for name, count in stats.counters().items()))
+            if trace:
+                with open(trace, 'a') as file:
+                    stats.write_trace(file, instance=filename[:-4], heuristic=lsh_names[lsh_key][4:])
+    else:
+        lsh_of = ''
+        lsh_time = ''
+
+    # how far the solution of the heuristics may be from the optimum
+    with profiler.phase('bound'):
+        bound = upper_bound(instance)
+    heuristic_of = objective_function(solution, instance.distances)
+
+    if exact is not None:
+        with profiler.phase('exact'):
+            result = solve_exact(instance, solution, exact, bool_verbose, bound)
+        bound = result.upper_bound
+        if result.optimal:
+            echo(f'Exact OF = {result.lower_bound} (optimal)')
         else:
-            abs_imp = ''
-            rel_imp = ''
+            echo(f'Exact OF in [{result.lower_bound}, {result.upper_bound}] (time limit reached)')
+        echo(f'Exact Time = {result.time:.3g} s')
 
-        # row (results' data) of current experiment with instance name
-        results.append([filename[:-4], ch_of, ch_time, lsh_of, lsh_time, abs_imp, rel_imp])
+    gap = (bound - heuristic_of) / bound * 100 if bound else 0.0
+    echo(f'Upper bound = {bound}, gap = {gap:.3g}%')
 
-        if verbose >= 2:
-            mp.plot_instance_solution(instance.points, solution, True)
+    if storage == 'lazy':
+        hits, misses, maxsize, currsize = instance.distances.cache_info()
+        echo(f'Rows cache: {hits} hits, {misses} misses, {currsize}/{maxsize} rows')
 
+    # if the current experiment uses a CH and a LSH
     if ch_key and lsh_key:
-        print(f'Improved instances: {improved_instances}/{number}')
-        avg_rel_imp = f'{mean(improvement_data):.3g}%'
-        print(f'Avg relative: {avg_rel_imp}')
-        results.append(['Improved instances', '', '', '', '', improved_instances, ''])
-        results.append(['Average', '', '', '', '', '', avg_rel_imp])
+        abs_imp = lsh_of - ch_of
+        rel_imp = (abs_imp / ch_of) * 100
+        if lsh_of > ch_of:
+            echo(f'Absoulte improvement: {abs_imp}')
+            echo(f'Relative improvement: {rel_imp:.3g}%')
+    else:
+        abs_imp = ''
+        rel_imp = ''
 
-    if save:
-        csv_name = f'{size}_{ch_names[ch_key]}{lsh_names[lsh_key]}.csv'
-        write_results(csv_name, results)
-        print(f'Experimental results have been saved to file {csv_name}.')
+    if verbose >= 2:
+        mp.plot_instance_solution(instance.points, solution, True)
+
+    # row (results' data) of current experiment with instance name
+    return (
+        [filename[:-4], ch_of, ch_time, lsh_of, lsh_time, abs_imp, rel_imp, bound, gap],
+        output,
+        profiler.times if buffered else {}
+    )
@@ -0,0 +1,22 @@
+'''
+Fixtures shared by the tests.
+'''
+
+import random
+from typing import Callable, Tuple
+
+import pytest
+
+from models import PDPInstance, Solution
+
+@pytest.fixture
+def random_instance() -> Callable[[int, int, int, int], Tuple[PDPInstance, Solution]]:
+    '''
+    Returns a function that makes a random instance of n points in a square grid of the given size,
+    with its distances, and a random solution, both reproducible from the seed.
+    '''
+    def make(n: int, p: int, size: int, seed: int) -> Tuple[PDPInstance, Solution]:
+        instance = PDPInstance.random(n, p, size, size, seed)
+        instance.set_distances()
+        return (instance, random.Random(seed).sample(instance.points, p))
+    return make
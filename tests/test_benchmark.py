@@ -0,0 +1,12 @@
+'''
+Tests for the comparison of benchmarks with a baseline.
+'''
+
+from benchmarker import compare_results
+
+def test_compare_results():
+    baseline = {'100_10': {'GC': 1.0, 'IM': 2.0}}
+    results = {'100_10': {'GC': 1.1, 'IM': 2.6, 'IF': 5.0}, '500_37': {'GC': 3.0}}
+    # only the benchmarks in both results are compared
+    assert compare_results(baseline, results, 0.2) == [('100_10', 'IM', 2.0, 2.6)]
+    assert len(compare_results(baseline, results, 0.05)) == 2
@@ -0,0 +1,32 @@
+'''
+Tests for the binary format of the instances' files.
+'''
+
+import numpy as np
+import pytest
+
+from file_handling.binary import HEADER, read_binary, write_binary
+
+def test_binary(tmp_path):
+    '''
+    Test that the coordinates and p are read as written, with the smallest type.
+    '''
+    filepath = str(tmp_path / '3_2_00.pdp')
+    coordinates = np.array([[1, 1], [1, 2], [30000, 4]])
+    write_binary(filepath, 2, coordinates)
+    assert (tmp_path / '3_2_00.pdp').stat().st_size == HEADER.size + 3 * 2 * 2
+    p, read = read_binary(filepath)
+    assert p == 2
+    assert read.tolist() == coordinates.tolist()
+
+    coordinates[2, 0] = 40000
+    write_binary(filepath, 2, coordinates)
+    assert read_binary(filepath)[1].tolist() == coordinates.tolist()
+
+    # truncated file
+    with open(filepath, 'rb') as file:
+        content = file.read()
+    with open(filepath, 'wb') as file:
+        file.write(content[:-1])
+    with pytest.raises(ValueError):
+        read_binary(filepath)
@@ -0,0 +1,51 @@
+'''
+Tests for the cache of the distances matrices.
+'''
+
+import os
+
+import numpy as np
+
+from file_handling.cache import load_distances
+from models import PDPInstance, Point
+
+points = [
+    Point(0, 1, 1),
+    Point(1, 1, 2),
+    Point(2, 1, 4)
+]
+matrix = [
+    [0, 1, 3],
+    [1, 0, 2],
+    [3, 2, 0]
+]
+
+def test_cache(tmp_path):
+    '''
+    Test that the cache is written, memory-mapped and rebuilt when the file changes.
+    '''
+    filepath = tmp_path / '3_2_00.dat'
+    filepath.write_text('\n'.join(str(point) for point in points))
+
+    instance = PDPInstance(2, points, False)
+    load_distances(instance, str(filepath))
+    assert instance.distances.tolist() == matrix
+    caches = os.listdir(tmp_path)
+    assert len(caches) == 2
+
+    instance = PDPInstance(2, points, False)
+    load_distances(instance, str(filepath))
+    assert isinstance(instance.distances, np.memmap)
+    assert instance.distances.tolist() == matrix
+
+    # the content changes, so the cache is stale
+    filepath.write_text('\n'.join(str(point) for point in points) + '\n')
+    instance = PDPInstance(2, points, False, 'condensed')
+    load_distances(instance, str(filepath))
+    assert instance.distances.tolist() == matrix
+    new_caches = os.listdir(tmp_path)
+    assert len(new_caches) == 3
+    instance = PDPInstance(2, points, False)
+    load_distances(instance, str(filepath))
+    assert sorted(os.listdir(tmp_path)) != sorted(new_caches)
+    assert len(os.listdir(tmp_path)) == 3
@@ -0,0 +1,26 @@
+'''
+Tests of the incremental evaluation of interchanges.
+'''
+
+import random
+
+from heuristic.evaluator import SwapEvaluator
+from heuristic.functions import objective_function, get_closest_points
+
+def test_swap_evaluator(random_instance):
+    '''
+    Test the evaluations and the updates against the objective function.
+    '''
+    instance, solution = random_instance(60, 8, 100, 0)
+    rng = random.Random(0)
+    evaluator = SwapEvaluator(solution, instance.distances)
+    for _ in range(50):
+        assert evaluator.objective == objective_function(solution, instance.distances)
+        x1, x2 = get_closest_points(solution, instance.distances)
+        assert evaluator.closest_points() == (x1.index, x2.index)
+        x = rng.choice(solution)
+        y = rng.choice([p for p in instance.points if p not in solution])
+        swapped = [p for p in solution if p != x] + [y]
+        assert evaluator.evaluate(x.index, y.index) == objective_function(swapped, instance.distances)
+        solution = swapped
+        evaluator.swap(x.index, y.index)
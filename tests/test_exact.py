@@ -0,0 +1,67 @@
+'''
+Tests of the exact algorithm.
+'''
+
+from itertools import combinations
+
+from exact import solve_exact, degree_bound, packing_bound, upper_bound
+from heuristic.constructive import greedy_construction
+from heuristic.functions import objective_function
+from models import PDPInstance, Point
+
+def test_solve_exact(random_instance):
+    for seed in range(5):
+        instance, _ = random_instance(12, 4, 50, seed)
+        # brute force over every solution
+        optimum = max(
+            objective_function(solution, instance.distances)
+            for solution in combinations(instance.points, instance.p)
+        )
+        for solution in (None, greedy_construction(instance)):
+            result = solve_exact(instance, solution)
+            assert result.optimal
+            assert result.lower_bound == result.upper_bound == optimum
+            assert objective_function(result.solution, instance.distances) == optimum
+
+def test_solve_exact_storages():
+    coordinates = PDPInstance.random(20, 5, 100, 100, 1).coordinates
+    expected = solve_exact(PDPInstance(5, None, coordinates=coordinates))
+    for storage in ('condensed', 'lazy'):
+        result = solve_exact(PDPInstance(5, None, storage=storage, coordinates=coordinates))
+        assert result.lower_bound == expected.lower_bound
+
+def test_solve_exact_time_limit(random_instance):
+    instance, _ = random_instance(12, 4, 50, 0)
+    solution = greedy_construction(instance)
+    result = solve_exact(instance, solution, time_limit=0)
+    # nothing is proven, the bounds are the ones of the heuristic and of the greatest distance
+    assert not result.optimal
+    assert result.lower_bound == objective_function(solution, instance.distances)
+    assert result.lower_bound <= result.upper_bound
+
+    instance, _ = random_instance(16, 5, 40, 142)
+    solution = greedy_construction(instance)
+    for time_limit in (0.0002, 0.0005, 0.001, 0.002) * 5:
+        result = solve_exact(instance, solution, time_limit)
+        # the lower bound is the objective of the solution, not the threshold it was found for
+        assert result.lower_bound == objective_function(result.solution, instance.distances)
+        assert result.optimal == (result.lower_bound == result.upper_bound)
+
+def test_upper_bounds(random_instance):
+    for seed in range(20):
+        instance, _ = random_instance(10, 4, 30, seed)
+        optimum = solve_exact(instance).lower_bound
+        assert degree_bound(instance) >= optimum
+        assert packing_bound(instance) >= optimum
+        assert upper_bound(instance) == min(degree_bound(instance), packing_bound(instance))
+    # the lazy storage doesn't compute every distance for the degree bound
+    lazy = PDPInstance(4, None, storage='lazy', coordinates=instance.coordinates)
+    assert upper_bound(lazy) == packing_bound(lazy)
+
+def test_packing_bound_line():
+    # 5 points on a segment of length 12, 3 of them are at most 6 apart
+    points = [Point(i, x, 0) for i, x in enumerate((0, 2, 5, 9, 12))]
+    instance = PDPInstance(3, points)
+    assert packing_bound(instance) == 6
+    # the points 0, 5 and 12
+    assert solve_exact(instance).lower_bound == 5
@@ -0,0 +1,40 @@
+'''
+Tests for reading the instances' files.
+'''
+
+import pytest
+
+import file_handling.file_io as file_io
+from file_handling.file_io import parse_dat, p_from_filename, read_instance
+
+def test_parse_dat():
+    '''
+    Test that the header, if any, gives n and p.
+    '''
+    body = '0 1 1\n1 1 2\n2 1 4'
+    p, indexes, coordinates = parse_dat(body, 2)
+    assert p == 2
+    assert indexes.tolist() == [0, 1, 2]
+    assert coordinates.tolist() == [[1, 1], [1, 2], [1, 4]]
+
+    p, _, coordinates = parse_dat('3 1\n' + body + '\n')
+    assert p == 1
+    assert len(coordinates) == 3
+
+    # p is unknown, n is wrong, or there is something that is not an integer
+    for text, p in ((body, None), ('4 1\n' + body, None), (body.replace('4', '4.5'), 2)):
+        with pytest.raises(ValueError):
+            parse_dat(text, p)
+
+def test_p_from_filename():
+    assert p_from_filename('1000_50_01.dat') == 50
+    assert p_from_filename('renamed.dat') is None
+
+def test_read_instance_cache_size(tmp_path, monkeypatch):
+    '''
+    Test that the lazy storage caches as many rows as requested.
+    '''
+    monkeypatch.setattr(file_io, 'get_filepath', lambda filename, folder='instances': str(tmp_path / filename))
+    (tmp_path / '3_2_00.dat').write_text('3 2\n0 1 1\n1 1 2\n2 1 4')
+    instance = read_instance('3_2_00.dat', 'lazy', cache_size=2)
+    assert instance.distances.cache_info().maxsize == 2
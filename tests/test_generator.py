@@ -0,0 +1,26 @@
+'''
+Tests for writing generated instances.
+'''
+
+import file_handling.file_io as file_io
+import file_handling.path as path
+from file_handling import write_instance, free_indexes
+from models import PDPInstance
+
+def test_write_instance(tmp_path, monkeypatch):
+    '''
+    Test that the free indexes are found at once and taken indexes are skipped when writing.
+    '''
+    get_filepath = lambda filename, folder='instances': str(tmp_path / filename)
+    monkeypatch.setattr(file_io, 'get_filepath', get_filepath)
+    monkeypatch.setattr(path, 'get_filepath', get_filepath)
+    for name in ('10_2_00.dat', '10_2_02.pdp', '10_2_03.dat.full.0.npy', '10_3_01.dat'):
+        (tmp_path / name).write_text('')
+
+    assert free_indexes(10, 2, 3) == [1, 3, 4]
+
+    instance = PDPInstance.random(10, 2, 5, 5, seed=1)
+    # another writer took the index 1 meanwhile
+    (tmp_path / '10_2_01.dat').write_text('')
+    assert write_instance(instance, 1) == '10_2_03.dat'
+    assert (tmp_path / '10_2_03.dat').read_text().startswith('10 2\n0 ')
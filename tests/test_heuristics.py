@@ -2,7 +2,15 @@
 Tests of the heuristic algorithms and functions.
 '''
 
-from heuristic.functions import objective_function
+import io
+import json
+
+from heuristic.constructive import greedy_construction
+from heuristic.local_search import first_interchange, best_interchange, swap_interchange
+from heuristic.stats import SearchStats
+from heuristic.budget import Budget
+from heuristic.grasp import grasp
+from heuristic.functions import objective_function, get_closest_points
 from models import PDPInstance, Point
 
 def test_objective_function():
@@ -15,3 +23,84 @@ def test_objective_function():
     # dummy instance
     instance = PDPInstance(1, points)
     assert objective_function(points, instance.distances) == 1
+
+def test_greedy_construction():
+    # points on a line: 0, 1, 3, 6 and 10
+    points = [Point(i, x, 0) for i, x in enumerate((0, 1, 3, 6, 10))]
+    instance = PDPInstance(3, points)
+    solution = greedy_construction(instance)
+    # starts with the extremes and adds the point farthest to both
+    assert [p.index for p in solution] == [0, 4, 3]
+
+def test_closest_points():
+    points = [Point(i, x, 0) for i, x in enumerate((0, 12, 3, 5, 7))]
+    instance = PDPInstance(3, points)
+    # 3-5 and 5-7 are both at distance 2, the pair with smallest indexes is chosen
+    x1, x2 = get_closest_points(points[1:], instance.distances)
+    assert (x1.index, x2.index) == (2, 3)
+
+def test_swap_interchange(random_instance):
+    instance, start = random_instance(40, 6, 50, 1)
+    solution = swap_interchange(instance, start)
+    value = objective_function(solution, instance.distances)
+    # no interchange of a point in the solution with a point outside improves it
+    for x in solution:
+        for y in instance.points:
+            if y not in solution:
+                swapped = [p for p in solution if p != x] + [y]
+                assert objective_function(swapped, instance.distances) <= value
+
+def test_grasp(random_instance):
+    instance, _ = random_instance(60, 5, 50, 2)
+    solution, rate = grasp(instance, best_interchange, 4, starts=6, seed=3)
+    assert len(set(p.index for p in solution)) == instance.p
+    assert rate > 0
+    # the same seeds give the same starts in any process
+    again, _ = grasp(instance, best_interchange, 4, starts=6, seed=3)
+    assert again == solution
+    parallel, _ = grasp(instance, best_interchange, 4, starts=6, jobs=2, seed=3)
+    assert objective_function(parallel, instance.distances) >= objective_function(
+        grasp(instance, best_interchange, 4, starts=3, seed=3)[0], instance.distances
+    )
+
+def test_parallel_best_interchange(random_instance):
+    instance, solution = random_instance(80, 8, 30, 4)
+    # the chunks give the same interchanges, ties included
+    assert best_interchange(instance, solution, jobs=3) == best_interchange(instance, solution)
+    assert not instance.shared
+
+def test_search_stats(random_instance):
+    instance, solution = random_instance(60, 6, 40, 3)
+    for heuristic in (first_interchange, best_interchange):
+        stats = SearchStats()
+        result = heuristic(instance, solution, stats=stats)
+        # the last iteration doesn't improve
+        assert stats.iterations == stats.swaps + 1
+        assert stats.evaluations == 2 * stats.candidates
+        objectives = [objective for _, _, objective in stats.trace]
+        assert objectives == sorted(set(objectives))
+        assert objectives[-1] == objective_function(result, instance.distances)
+
+        file = io.StringIO()
+        stats.write_trace(file, instance='60_6')
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+        assert len(lines) == stats.swaps + 1
+        assert lines[-1]['instance'] == '60_6'
+
+def test_budget(random_instance):
+    instance, start = random_instance(60, 6, 40, 5)
+    budget = Budget(iterations=1)
+    # the solution is completed when the budget runs out
+    solution = greedy_construction(instance, budget=budget)
+    assert not budget.converged
+    assert len(set(solution)) == instance.p
+    assert solution[:3] == greedy_construction(instance)[:3]
+
+    for heuristic in (first_interchange, best_interchange, swap_interchange):
+        stats = SearchStats()
+        result = heuristic(instance, start, stats=stats, budget=Budget(iterations=2))
+        assert stats.iterations <= 2
+        assert objective_function(result, instance.distances) >= objective_function(start, instance.distances)
+        budget = Budget()
+        heuristic(instance, start, budget=budget)
+        assert budget.converged
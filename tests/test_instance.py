@@ -22,7 +22,7 @@ def test_matrix():
         [1, 0, 2],
         [3, 2, 0]
     ]
-    assert instance.distances == matrix
+    assert instance.distances.tolist() == matrix
 
 def test_farthest():
     '''
@@ -30,3 +30,59 @@ def test_farthest():
     '''
     p1, p2 = instance.get_farthest_points()
     assert str(p1) + ' ' + str(p2) == '0 1 1 2 1 4'
+
+def test_condensed_matrix():
+    '''
+    Test the condensed storage against the full distances matrix.
+    '''
+    condensed = PDPInstance(1, points, storage='condensed')
+    assert condensed.distances.data.tolist() == [1, 3, 2]
+    assert condensed.distances.tolist() == instance.distances.tolist()
+    assert condensed.distances[2, 0] == 3
+    assert condensed.distances[1].tolist() == [1, 0, 2]
+    assert condensed.get_farthest_points() == instance.get_farthest_points()
+
+def test_lazy_matrix():
+    '''
+    Test the distances computed on demand and the counters of its rows cache.
+    '''
+    lazy = PDPInstance(1, points, storage='lazy', cache_size=1)
+    assert lazy.distances.tolist() == instance.distances.tolist()
+    assert lazy.distances[2, 0] == 3
+    assert lazy.distances[0].tolist() == [0, 1, 3]
+    assert lazy.distances[0].tolist() == [0, 1, 3]
+    # row 1 discards row 0 from the cache
+    assert lazy.distances[1].tolist() == [1, 0, 2]
+    assert lazy.distances[0].tolist() == [0, 1, 3]
+    assert lazy.distances.cache_info() == (1, 3, 1, 1)
+    assert lazy.get_farthest_points() == instance.get_farthest_points()
+
+def test_farthest_geometric():
+    '''
+    Test the farthest points found by the convex hull against the matrix scan.
+    '''
+    square = [Point(i, x, y) for i, (x, y) in enumerate(((5, 5), (0, 0), (9, 1), (10, 10), (1, 9), (4, 6)))]
+    square_instance = PDPInstance(2, square)
+    p1, p2 = square_instance.get_farthest_points()
+    assert (p1.index, p2.index) == (1, 3)
+    assert square_instance.get_farthest_points(geometric=False) == (p1, p2)
+    # collinear points
+    line = [Point(i, 3 * i % 7, 2 * (3 * i % 7)) for i in range(7)]
+    p1, p2 = PDPInstance(2, line).get_farthest_points()
+    assert (p1.x, p2.x) == (0, 6)
+    # (5, 5)-(1, 2) and (5, 5)-(1, 1) are both at distance 5 when truncated,
+    # the matrix scan finds first the one of (1, 2), which is not a vertex of the hull
+    ties = [Point(i, x, y) for i, (x, y) in enumerate(((5, 5), (1, 2), (1, 1), (1, 4)))]
+    ties_instance = PDPInstance(2, ties)
+    p1, p2 = ties_instance.get_farthest_points()
+    assert (p1.index, p2.index) == (0, 1)
+    assert ties_instance.get_farthest_points(geometric=False) == (p1, p2)
+
+def test_random():
+    instance = PDPInstance.random(50, 5, 9, 4, seed=1)
+    # every cell of the 10 * 5 grid is used once
+    assert len(set(map(tuple, instance.coordinates.tolist()))) == 50
+    assert instance.coordinates.min() == 0
+    assert instance.coordinates.max(axis=0).tolist() == [9, 4]
+    assert [p.index for p in instance.points] == list(range(50))
+    assert PDPInstance.random(50, 5, 9, 4, seed=1).coordinates.tolist() == instance.coordinates.tolist()
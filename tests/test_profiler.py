@@ -0,0 +1,23 @@
+'''
+Tests for the profiler of the phases of solving the instances.
+'''
+
+from solver.profiler import Profiler
+
+def test_profiler(tmp_path):
+    disabled = Profiler()
+    with disabled.phase('read'):
+        pass
+    assert disabled.times == {}
+
+    profiler = Profiler(dump_dir=str(tmp_path))
+    assert profiler.enabled
+    for _ in range(2):
+        with profiler.phase('local search'):
+            sum(range(1000))
+    profiler.add('read', 1.0)
+    assert profiler.times['read'] == 1.0
+    report = profiler.report()
+    # the phases are reported in order
+    assert report[1].split()[0] == 'read'
+    assert (tmp_path / 'local_search.pstats').exists()
@@ -0,0 +1,58 @@
+'''
+Tests for the distances in shared memory.
+'''
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from models import PDPInstance, Point
+
+points = [
+    Point(0, 1, 1),
+    Point(1, 1, 2),
+    Point(2, 1, 4),
+    Point(3, 5, 4)
+]
+
+def farthest_distance(instance: PDPInstance) -> int:
+    '''
+    Returns the distance between the farthest points of an instance.
+    '''
+    i, j = instance.get_farthest_points(False)
+    return int(instance.distances[i.index, j.index])
+
+@pytest.mark.parametrize('storage', ['full', 'condensed'])
+def test_shared(storage):
+    '''
+    Test that the shared distances are sent to other processes without copying them,
+    and freed when released.
+    '''
+    instance = PDPInstance(2, points, storage=storage)
+    matrix = instance.distances.tolist()
+    copied = len(pickle.dumps(instance))
+
+    with instance.share():
+        assert instance.shared
+        assert instance.distances.tolist() == matrix
+        data = pickle.dumps(instance)
+        assert len(data) < copied
+        # an attached copy detaches from the block once its distances are collected
+        attached = pickle.loads(data)
+        block = attached._PDPInstance__block
+        del attached
+        assert block.buf is None
+        # a view of the shared distances kept after they are released
+        shared = instance.distances if storage == 'full' else instance.distances.data
+        view = shared[1:]
+        values = view.tolist()
+
+        with ProcessPoolExecutor(2) as executor:
+            assert list(executor.map(farthest_distance, [instance] * 4)) == [5] * 4
+
+    assert not instance.shared
+    assert instance.distances.tolist() == matrix
+    assert view.tolist() == values
+    with pytest.raises(FileNotFoundError):
+        pickle.loads(data)